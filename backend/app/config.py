@@ -5,6 +5,7 @@ Centralizes all configuration values including model paths and app settings.
 
 import os
 from pathlib import Path
+from urllib.parse import urlsplit
 
 
 # Base directory (backend folder)
@@ -16,6 +17,38 @@ MODEL_PATH = os.getenv(
     str(BASE_DIR.parent / "model_training" / "saved_model" / "fake-news-bert")
 )
 
+# Inference backend: "onnx" (ONNX Runtime INT8, falls back to torch) or "torch"
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "onnx").lower()
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", str(Path(MODEL_PATH) / "onnx"))
+# PyTorch backend only: IPEX BF16 on AVX512-BF16/AMX CPUs (needs intel-extension-for-pytorch)
+USE_IPEX_BF16 = os.getenv("USE_IPEX_BF16", "false").lower() == "true"
+# PyTorch backend only: TorchScript-trace and freeze the model at load
+USE_TORCHSCRIPT = os.getenv("USE_TORCHSCRIPT", "true").lower() == "true"
+# PyTorch backend only: skip dynamic INT8 quantization (set to 1 where INT8 is slower than FP32)
+DISABLE_QUANT = os.getenv("DISABLE_QUANT", "0") == "1"
+
+# Intra-op threads per worker process. Scale out with uvicorn workers
+# (WEB_CONCURRENCY ~= physical cores / INFERENCE_NUM_THREADS) rather than
+# spreading each small BERT op across every core. Keep FP32/INT8 on CPUs
+# without native BF16 support; emulated low precision is far slower.
+INFERENCE_NUM_THREADS = int(os.getenv("OMP_NUM_THREADS", "4"))
+
+# Optional cheap first-stage model (e.g. a distilled DistilBERT/MiniLM
+# checkpoint). Inputs it classifies with confidence >= FAST_MODEL_THRESHOLD
+# skip the full model; the rest are escalated. Unset disables the cascade.
+FAST_MODEL_PATH = os.getenv("FAST_MODEL_PATH")
+FAST_MODEL_THRESHOLD = float(os.getenv("FAST_MODEL_THRESHOLD", "0.98"))
+
+# Per-process LRU cache of inference results for repeated inputs (0 disables)
+INFERENCE_CACHE_SIZE = int(os.getenv("INFERENCE_CACHE_SIZE", "4096"))
+# Per-process LRU cache of cleaned text + headline flag per raw input (0 disables)
+PREPROCESS_CACHE_SIZE = int(os.getenv("PREPROCESS_CACHE_SIZE", "2048"))
+
+# Request coalescing for /analyze: gather requests for up to BATCH_WINDOW_MS
+# into one forward pass of at most BATCH_MAX_SIZE texts (0 disables batching)
+BATCH_WINDOW_MS = int(os.getenv("BATCH_WINDOW_MS", "0"))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+
 # API configuration
 API_TITLE = "Fake News Detector API"
 API_DESCRIPTION = """
@@ -47,16 +80,61 @@ MONGODB_URI = os.getenv(
 )
 DATABASE_NAME = os.getenv("DATABASE_NAME", "fake_news_db")
 
+
+def _is_atlas_uri(uri: str) -> bool:
+    """Detect MongoDB Atlas from the URI scheme or seed-list hostnames."""
+    parts = urlsplit(uri)
+    if parts.scheme == "mongodb+srv":
+        return True
+    # Seed lists ("h1:27017,h2:27017") aren't parseable by urlsplit.hostname
+    hosts = parts.netloc.rpartition("@")[2].split(",")
+    return any(h.split(":")[0].lower().endswith(".mongodb.net") for h in hosts)
+
+
+def _is_single_host_uri(uri: str) -> bool:
+    """True for a plain mongodb:// URI naming one host and no replica set."""
+    parts = urlsplit(uri)
+    if parts.scheme != "mongodb":
+        return False
+    hosts = parts.netloc.rpartition("@")[2].split(",")
+    return len(hosts) == 1 and "replicaset=" not in parts.query.lower()
+
+
+# Parsed once at import; a database or option named "mongodb.net" no longer matches
+IS_ATLAS = _is_atlas_uri(MONGODB_URI)
+
+# MongoDB client tuning
+MONGO_POOL_MAX = int(os.getenv("MONGO_POOL_MAX", "50"))
+MONGO_POOL_MIN = int(os.getenv("MONGO_POOL_MIN", "5"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+MONGO_APP_NAME = os.getenv("MONGO_APP_NAME", "fake-news-api")
+# Skip replica-set discovery only for a single standalone host unless overridden;
+# forcing it against a replica set member would pin writes to that node
+MONGO_DIRECT_CONNECTION = os.getenv(
+    "MONGO_DIRECT_CONNECTION", str(_is_single_host_uri(MONGODB_URI))
+).lower() == "true"
+
+# Prediction retention (TTL index) and /history lookback window; 0 disables
+PREDICTION_TTL_SECONDS = int(os.getenv("PREDICTION_TTL_SECONDS", str(30 * 86400)))
+HISTORY_LOOKBACK_DAYS = int(os.getenv("HISTORY_LOOKBACK_DAYS", "7"))
+
+# Prediction write batching (documents are flushed with insert_many)
+MONGO_WRITE_QUEUE_SIZE = int(os.getenv("MONGO_WRITE_QUEUE_SIZE", "10000"))
+MONGO_WRITE_BATCH_SIZE = int(os.getenv("MONGO_WRITE_BATCH_SIZE", "256"))
+MONGO_WRITE_FLUSH_MS = int(os.getenv("MONGO_WRITE_FLUSH_MS", "50"))
+
 # Model version for tracking predictions
 MODEL_VERSION = os.getenv("MODEL_VERSION", "fake-news-bert-v1")
 
-# AWS S3 configuration for model storage
+# AWS S3 configuration for model storage (optional: without S3_BUCKET the
+# model must already exist at MODEL_PATH)
 S3_BUCKET = os.getenv("S3_BUCKET")
 S3_MODEL_KEY = os.getenv("S3_MODEL_KEY")
 AWS_REGION = os.getenv("AWS_REGION")
 
 # Fail-fast validation
-if not all([S3_BUCKET, S3_MODEL_KEY, AWS_REGION]):
+if S3_BUCKET and not all([S3_MODEL_KEY, AWS_REGION]):
     missing = [k for k, v in {
         "S3_BUCKET": S3_BUCKET, 
         "S3_MODEL_KEY": S3_MODEL_KEY, 
@@ -3,17 +3,65 @@ MongoDB database connection and operations.
 Uses Motor (async MongoDB driver) for FastAPI integration.
 """
 
+import asyncio
 import logging
+import time
+import zlib
 from typing import List, Optional
-from datetime import datetime
 
+from bson import Binary, DatetimeMS
+from pymongo import IndexModel
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 
-from .config import MONGODB_URI, DATABASE_NAME
+from .config import (
+    MONGODB_URI,
+    DATABASE_NAME,
+    IS_ATLAS,
+    MONGO_POOL_MAX,
+    MONGO_POOL_MIN,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_COMPRESSORS,
+    MONGO_APP_NAME,
+    MONGO_DIRECT_CONNECTION,
+    PREDICTION_TTL_SECONDS,
+    HISTORY_LOOKBACK_DAYS,
+    MONGO_WRITE_QUEUE_SIZE,
+    MONGO_WRITE_BATCH_SIZE,
+    MONGO_WRITE_FLUSH_MS,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Index names (used with hint() so the planner can't pick a worse plan)
+INDEX_CREATED_AT = "created_at_-1"
+INDEX_PREDICTION_CREATED = "pred_created"
+INDEX_MODEL_VERSION_CREATED = "mv_created"
+INDEX_TTL_CREATED = "ttl_created"
+
+# Long articles are stored zlib-compressed with a short plain-text preview
+MAX_STORE_TEXT_BYTES = 4096
+TEXT_PREVIEW_CHARS = 256
+TEXT_COMPRESSION_LEVEL = 3
+
+# Queue sentinel telling the flusher to insert its current batch and exit
+_STOP = object()
+
+# Index specs (keys, options) keyed by name so existing indexes can be skipped at startup
+INDEX_SPECS = {
+    # created_at for faster sorting
+    INDEX_CREATED_AT: ([("created_at", -1)], {}),
+    # Compound indexes serve filtered history without an in-memory sort
+    INDEX_PREDICTION_CREATED: ([("prediction", 1), ("created_at", -1)], {}),
+    INDEX_MODEL_VERSION_CREATED: ([("model_version", 1), ("created_at", -1)], {}),
+}
+if PREDICTION_TTL_SECONDS > 0:
+    # TTL requires an ascending single-field index, separate from the sort index.
+    # Changing PREDICTION_TTL_SECONDS later needs a collMod on the existing index.
+    INDEX_SPECS[INDEX_TTL_CREATED] = (
+        [("created_at", 1)], {"expireAfterSeconds": PREDICTION_TTL_SECONDS}
+    )
+
 
 class MongoDB:
     """
@@ -26,6 +74,8 @@ class MongoDB:
         self.db: Optional[AsyncIOMotorDatabase] = None
         self.predictions: Optional[AsyncIOMotorCollection] = None
         self._is_connected: bool = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
     
     async def connect(self) -> bool:
         """
@@ -35,26 +85,39 @@ class MongoDB:
             True if connection successful, False otherwise
         """
         try:
-            logger.info(f"Connecting to MongoDB: {DATABASE_NAME}")
+            logger.info("Connecting to MongoDB: %s", DATABASE_NAME)
             
-            # Detect if using MongoDB Atlas or local MongoDB
-            is_atlas = "mongodb+srv://" in MONGODB_URI or "mongodb.net" in MONGODB_URI
+            # Pool, compression and identification settings shared by both targets
+            client_options = dict(
+                serverSelectionTimeoutMS=5000,
+                maxPoolSize=MONGO_POOL_MAX,
+                minPoolSize=MONGO_POOL_MIN,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                compressors=MONGO_COMPRESSORS,
+                zlibCompressionLevel=3,
+                appname=MONGO_APP_NAME,
+                retryWrites=True
+            )
             
             # Create async MongoDB client with appropriate configuration
-            if is_atlas:
+            if IS_ATLAS:
                 # MongoDB Atlas requires TLS
                 self.client = AsyncIOMotorClient(
                     MONGODB_URI,
                     tls=True,
                     tlsAllowInvalidCertificates=True,
-                    serverSelectionTimeoutMS=5000
+                    w="majority",
+                    **client_options
                 )
             else:
                 # Local MongoDB (explicitly disable TLS)
                 self.client = AsyncIOMotorClient(
                     MONGODB_URI,
                     tls=False,  # Explicitly disable TLS
-                    serverSelectionTimeoutMS=5000
+                    w=1,
+                    # Single local server: skip replica-set discovery
+                    directConnection=MONGO_DIRECT_CONNECTION,
+                    **client_options
                 )
             
             # Test connection
@@ -64,23 +127,101 @@ class MongoDB:
             self.db = self.client[DATABASE_NAME]
             self.predictions = self.db["predictions"]
             
-            # Create index on created_at for faster sorting
-            await self.predictions.create_index([("created_at", -1)])
+            await self._ensure_indexes()
+            
+            # Start background batch writer
+            self._queue = asyncio.Queue(maxsize=MONGO_WRITE_QUEUE_SIZE)
+            self._flusher_task = asyncio.create_task(self._flusher())
             
             self._is_connected = True
             logger.info("MongoDB connected successfully!")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {str(e)}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             self._is_connected = False
             return False
     
+    async def _ensure_indexes(self):
+        """Create any missing indexes, skipping those that already exist."""
+        existing = {ix["name"] async for ix in self.predictions.list_indexes()}
+        missing = [name for name in INDEX_SPECS if name not in existing]
+        if not missing:
+            return
+        
+        logger.info("Creating indexes: %s", ", ".join(missing))
+        # Single createIndexes command builds all missing indexes in one pass
+        await self.predictions.create_indexes(
+            [
+                IndexModel(INDEX_SPECS[name][0], name=name, **INDEX_SPECS[name][1])
+                for name in missing
+            ]
+        )
+    
+    async def _flusher(self):
+        """
+        Drain the write queue and persist documents with insert_many.
+        
+        A batch is flushed when it reaches MONGO_WRITE_BATCH_SIZE documents
+        or MONGO_WRITE_FLUSH_MS milliseconds after its first document,
+        whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        flush_interval = MONGO_WRITE_FLUSH_MS / 1000
+        
+        while True:
+            document = await self._queue.get()
+            if document is _STOP:
+                return
+            batch = [document]
+            deadline = loop.time() + flush_interval
+            stopping = False
+            
+            while len(batch) < MONGO_WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if document is _STOP:
+                    stopping = True
+                    break
+                batch.append(document)
+            
+            await self._insert_batch(batch)
+            if stopping:
+                return
+    
+    async def _insert_batch(self, batch: List[dict]):
+        """Insert a batch of documents, logging (not raising) on failure."""
+        try:
+            await self.predictions.insert_many(batch, ordered=False)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Saved %d predictions", len(batch))
+        except Exception as e:
+            logger.error("Failed to save %s predictions: %s", len(batch), e)
+    
     async def disconnect(self):
-        """Close MongoDB connection."""
+        """Flush pending writes and close MongoDB connection."""
+        # Stop accepting writes, then let the flusher insert its current batch
+        self._is_connected = False
+        if self._flusher_task:
+            if not self._flusher_task.done():
+                # Blocks only while the queue is full; the flusher keeps draining it
+                await self._queue.put(_STOP)
+            await self._flusher_task
+            self._flusher_task = None
+        
+        if self._queue and not self._queue.empty():
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            await self._insert_batch(pending)
+        
         if self.client:
             self.client.close()
-            self._is_connected = False
             logger.info("MongoDB disconnected")
     
     @property
@@ -93,10 +234,12 @@ class MongoDB:
         text: str,
         prediction: str,
         confidence: float,
-        model_version: str
+        model_version: str,
+        _time=time.time,
+        _DatetimeMS=DatetimeMS
     ) -> Optional[str]:
         """
-        Save a prediction to the database.
+        Queue a prediction for the background batch writer.
         
         Args:
             text: The news article text
@@ -105,7 +248,7 @@ class MongoDB:
             model_version: Model version identifier
             
         Returns:
-            Document ID if successful, None otherwise
+            None; documents are persisted asynchronously by the flusher
         """
         if not self._is_connected:
             logger.warning("Cannot save prediction: MongoDB not connected")
@@ -113,27 +256,44 @@ class MongoDB:
         
         try:
             document = {
-                "text": text,
                 "prediction": prediction,
                 "confidence": confidence,
                 "model_version": model_version,
-                "created_at": datetime.utcnow()
+                # Milliseconds since epoch, stored as a BSON date
+                "created_at": _DatetimeMS(int(_time() * 1000))
             }
             
-            result = await self.predictions.insert_one(document)
-            logger.info(f"Saved prediction: {result.inserted_id}")
-            return str(result.inserted_id)
+            encoded = text.encode("utf-8")
+            if len(encoded) > MAX_STORE_TEXT_BYTES:
+                document["text_gz"] = Binary(zlib.compress(encoded, TEXT_COMPRESSION_LEVEL))
+                document["text_len"] = len(encoded)
+                document["text_preview"] = text[:TEXT_PREVIEW_CHARS]
+            else:
+                document["text"] = text
+            
+            self._queue.put_nowait(document)
+            return None
             
+        except asyncio.QueueFull:
+            logger.warning("Write queue full, dropping prediction")
+            return None
         except Exception as e:
-            logger.error(f"Failed to save prediction: {str(e)}")
+            logger.error("Failed to save prediction: %s", e)
             return None
     
-    async def get_recent_predictions(self, limit: int = 10) -> List[dict]:
+    async def get_recent_predictions(
+        self,
+        limit: int = 10,
+        prediction: Optional[str] = None,
+        model_version: Optional[str] = None
+    ) -> List[dict]:
         """
         Retrieve recent predictions from the database.
         
         Args:
             limit: Maximum number of predictions to return
+            prediction: Only return predictions with this label
+            model_version: Only return predictions from this model version
             
         Returns:
             List of prediction documents (newest first)
@@ -142,30 +302,47 @@ class MongoDB:
             logger.warning("Cannot fetch predictions: MongoDB not connected")
             return []
         
-        try:
-            cursor = self.predictions.find(
-                {},
-                {
-                    "_id": 0,  # Exclude MongoDB _id from response
-                    "text": 1,
-                    "prediction": 1,
-                    "confidence": 1,
-                    "model_version": 1,
-                    "created_at": 1
+        query = {}
+        if prediction:
+            query["prediction"] = prediction
+            index = INDEX_PREDICTION_CREATED
+        elif model_version:
+            index = INDEX_MODEL_VERSION_CREATED
+        else:
+            index = INDEX_CREATED_AT
+        if model_version:
+            query["model_version"] = model_version
+        if HISTORY_LOOKBACK_DAYS > 0:
+            # Bound the index scan to the lookback window
+            cutoff_ms = int((time.time() - HISTORY_LOOKBACK_DAYS * 86400) * 1000)
+            query["created_at"] = {"$gte": DatetimeMS(cutoff_ms)}
+        
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"created_at": -1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": 0,  # Exclude MongoDB _id from response
+                # Compressed (long) articles return their preview instead
+                "text": {"$ifNull": ["$text", "$text_preview"]},
+                "prediction": 1,
+                "confidence": 1,
+                "model_version": 1,
+                # Format as ISO 8601 server-side for JSON serialization
+                "created_at": {
+                    "$dateToString": {"format": "%Y-%m-%dT%H:%M:%S.%LZ", "date": "$created_at"}
                 }
-            ).sort("created_at", -1).limit(limit)
-            
+            }}
+        ]
+        
+        try:
+            cursor = self.predictions.aggregate(pipeline, hint=index)
             predictions = await cursor.to_list(length=limit)
             
-            # Convert datetime to ISO string for JSON serialization
-            for pred in predictions:
-                if "created_at" in pred:
-                    pred["created_at"] = pred["created_at"].isoformat()
-            
             return predictions
             
         except Exception as e:
-            logger.error(f"Failed to fetch predictions: {str(e)}")
+            logger.error("Failed to fetch predictions: %s", e)
             return []
 
 
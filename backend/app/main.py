@@ -4,44 +4,101 @@ Defines API endpoints and application lifecycle.
 """
 
 import logging
-
-# Configure logger
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-from contextlib import asynccontextmanager
-from collections import defaultdict
+import queue
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Request, Depends, Security
+from fastapi import FastAPI, HTTPException, Depends, Security
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from .config import API_TITLE, API_DESCRIPTION, API_VERSION, CORS_ORIGINS, MODEL_VERSION, API_KEY_NAME, API_KEY
+from .config import API_TITLE, API_DESCRIPTION, API_VERSION, CORS_ORIGINS, MODEL_VERSION, API_KEY_NAME, API_KEY, BATCH_WINDOW_MS
 from .schemas import AnalyzeRequest, AnalyzeResponse, HealthResponse
-from .model import classifier
-from app.database import verify_db_connection
-# Trigger CI/CD Pipeline verification
-from app.model import analyze_news, load_model
+from .model import classifier, batcher, get_classifier
+from .database import mongodb
 from prometheus_fastapi_instrumentator import Instrumentator
 
+# Configure logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
-# Simple in-memory rate limiter
-rate_limit_store = defaultdict(list)
+def _configure_logging() -> Optional[QueueListener]:
+    """
+    Move the root handlers behind a queue for the life of the server.
+    
+    Records are formatted and written to stdout on a listener thread, so
+    request handlers only pay for a queue put. Called from lifespan, not
+    at import, so importing this module (e.g. in tests) leaves logging
+    untouched.
+    
+    Returns:
+        The started listener (stop it at shutdown), or None if the root
+        logger is already queued or has no handlers
+    """
+    root = logging.getLogger()
+    if not root.handlers or any(isinstance(h, QueueHandler) for h in root.handlers):
+        return None
+    listener = QueueListener(queue.SimpleQueue(), *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(listener.queue)]
+    listener.start()
+    return listener
+
+
+
+# Simple in-memory rate limiter (per-IP token bucket)
 RATE_LIMIT_REQUESTS = 10  # requests per window
 RATE_LIMIT_WINDOW = 60  # seconds
+RATE_LIMIT_REFILL_RATE = RATE_LIMIT_REQUESTS / RATE_LIMIT_WINDOW  # tokens per second
+RATE_LIMIT_MAX_TRACKED = 10_000  # evict the least recently seen IP beyond this many
+
+
+class TokenBucket:
+    """Token count and last refill time for a single client."""
+    __slots__ = ("tokens", "ts")
+    
+    def __init__(self, tokens: float, ts: float):
+        self.tokens = tokens
+        self.ts = ts
+
+
+# Least recently seen client first, so eviction at the cap is O(1)
+rate_limit_store: "OrderedDict[str, TokenBucket]" = OrderedDict()
 
-def is_rate_limited(client_ip: str) -> bool:
-    """Check if client IP is rate limited."""
-    now = time.time()
-    # Clean old requests
-    rate_limit_store[client_ip] = [t for t in rate_limit_store[client_ip] if now - t < RATE_LIMIT_WINDOW]
-    # Check limit
-    if len(rate_limit_store[client_ip]) >= RATE_LIMIT_REQUESTS:
+
+def is_rate_limited(
+    client_ip: str,
+    _now=time.monotonic,
+    _store=rate_limit_store,
+    _capacity=RATE_LIMIT_REQUESTS,
+    _rate=RATE_LIMIT_REFILL_RATE,
+    _max_tracked=RATE_LIMIT_MAX_TRACKED,
+    _Bucket=TokenBucket
+) -> bool:
+    """
+    Check if client IP is rate limited.
+    
+    Hot-path globals are bound as defaults (resolved once at import) so
+    each call uses local lookups. Callers pass only client_ip.
+    """
+    now = _now()
+    bucket = _store.get(client_ip)
+    if bucket is None:
+        if len(_store) >= _max_tracked:
+            _store.popitem(last=False)
+        _store[client_ip] = _Bucket(_capacity - 1, now)
+        return False
+    _store.move_to_end(client_ip)
+    # Refill proportionally to elapsed time, capped at bucket capacity
+    bucket.tokens = min(_capacity, bucket.tokens + (now - bucket.ts) * _rate)
+    bucket.ts = now
+    if bucket.tokens < 1:
         return True
-    # Add current request
-    rate_limit_store[client_ip].append(now)
+    bucket.tokens -= 1
     return False
 
 
@@ -51,11 +108,18 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     Loads the model at startup and handles cleanup at shutdown.
     """
+    log_listener = _configure_logging()
+    
     # Startup: Load the model
     logger.info("Starting up - Loading ML model...")
-    success = classifier.load()
+    success = get_classifier().is_loaded
+    # Cached for /health, which liveness/readiness probes hit frequently
+    app.state.model_loaded = bool(success)
     if not success:
         logger.warning("Model failed to load. API will return errors for predictions.")
+    elif BATCH_WINDOW_MS > 0:
+        logger.info("Batching /analyze requests (%s ms window)", BATCH_WINDOW_MS)
+        batcher.start()
     
     # Connect to MongoDB
     logger.info("Connecting to MongoDB...")
@@ -67,25 +131,78 @@ async def lifespan(app: FastAPI):
     
     # Shutdown: Cleanup
     logger.info("Shutting down...")
+    await batcher.stop()
     await mongodb.disconnect()
+    if log_listener is not None:
+        # Flush queued records and restore the original handlers
+        logging.getLogger().handlers = list(log_listener.handlers)
+        log_listener.stop()
 
 # Security Scheme
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
-async def version_middleware(request: Request, call_next):
-    """Add version header to response."""
-    response = await call_next(request)
-    response.headers["X-API-Version"] = API_VERSION
-    return response
-
-async def latency_middleware(request: Request, call_next):
-    """Log request latency."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    # Add scalar header for monitoring
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Paths served without header wrapping or latency accounting
+UNINSTRUMENTED_PATHS = frozenset({"/metrics", "/health"})
+# Paths subject to per-IP rate limiting
+RATE_LIMITED_PATHS = frozenset({"/analyze"})
+API_VERSION_HEADER = (b"x-api-version", API_VERSION.encode())
+RATE_LIMITED_PAYLOAD = b'{"detail":"Too many requests. Please try again later."}'
+RATE_LIMITED_START = {
+    "type": "http.response.start",
+    "status": 429,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(RATE_LIMITED_PAYLOAD)).encode()),
+    ],
+}
+RATE_LIMITED_BODY = {"type": "http.response.body", "body": RATE_LIMITED_PAYLOAD}
+
+
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware for rate limiting plus version and latency headers.
+    
+    Replaces the BaseHTTPMiddleware-style callbacks, which spawn an extra
+    task and memory channel per request. Probe and scrape paths are
+    passed straight through. Rate-limited requests get a pre-built 429
+    before any routing, dependency injection or body parsing.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        if path in UNINSTRUMENTED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                headers.append(API_VERSION_HEADER)
+                # Add scalar header for monitoring
+                headers.append((b"x-process-time", str(process_time).encode()))
+                message["headers"] = headers
+            await send(message)
+        
+        if path in RATE_LIMITED_PATHS:
+            client = scope.get("client")
+            client_ip = client[0] if client else "-"
+            if is_rate_limited(client_ip):
+                # Copy the start message so header wrapping never mutates the template
+                await send_wrapper(dict(RATE_LIMITED_START))
+                await send_wrapper(RATE_LIMITED_BODY)
+                return
+        
+        await self.app(scope, receive, send_wrapper)
 
 async def verify_api_key(api_key: str = Security(api_key_header)):
     """Verify API key if configured."""
@@ -103,11 +220,11 @@ app = FastAPI(
     description=API_DESCRIPTION,
     version=API_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     dependencies=[Depends(verify_api_key)] if API_KEY else None
 )
 
-app.middleware("http")(latency_middleware)
-app.middleware("http")(version_middleware)
+app.add_middleware(ObservabilityMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -119,7 +236,10 @@ app.add_middleware(
 )
 
 # Initialize Prometheus metrics
-Instrumentator().instrument(app).expose(app)
+Instrumentator(
+    should_ignore_untemplated=True,
+    excluded_handlers=list(UNINSTRUMENTED_PATHS),
+).instrument(app).expose(app)
 
 
 
@@ -138,12 +258,12 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "online",
-        "model_loaded": classifier.is_loaded
+        "model_loaded": app.state.model_loaded
     }
 
 
 @app.post("/analyze", response_model=AnalyzeResponse, tags=["Analysis"])
-async def analyze_text(request: AnalyzeRequest, req: Request):
+async def analyze_text(request: AnalyzeRequest):
     """
     Analyze news text for fake news detection.
     
@@ -152,14 +272,8 @@ async def analyze_text(request: AnalyzeRequest, req: Request):
     - **confidence**: Probability score (0.0 to 1.0)
     
     The model uses a fine-tuned BERT classifier trained on fake news datasets.
+    Requests are rate limited per client IP in ObservabilityMiddleware.
     """
-    # Rate limiting
-    client_ip = req.client.host
-    if is_rate_limited(client_ip):
-        raise HTTPException(
-            status_code=429,
-            detail="Too many requests. Please try again later."
-        )
     # Check if model is loaded
     if not classifier.is_loaded:
         raise HTTPException(
@@ -168,8 +282,11 @@ async def analyze_text(request: AnalyzeRequest, req: Request):
         )
     
     try:
-        # Make prediction
-        prediction, confidence = classifier.predict(request.text)
+        # Make prediction (coalesced with concurrent requests when batching is on)
+        if batcher.enabled:
+            prediction, confidence = await batcher.predict(request.text)
+        else:
+            prediction, confidence = classifier.predict(request.text)
         
         # Save to MongoDB (non-blocking, failures are logged but don't affect response)
         if mongodb.is_connected:
@@ -180,9 +297,10 @@ async def analyze_text(request: AnalyzeRequest, req: Request):
                 model_version=MODEL_VERSION
             )
         
-        return AnalyzeResponse(
+        # Values come from our own classifier; skip Pydantic validation
+        return AnalyzeResponse.model_construct(
             prediction=prediction,
-            confidence=confidence
+            confidence=float(confidence)
         )
         
     except ValueError as e:
@@ -191,7 +309,7 @@ async def analyze_text(request: AnalyzeRequest, req: Request):
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Prediction error: {str(e)}")
+        logger.error("Prediction error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="An error occurred during analysis. Please try again."
@@ -199,7 +317,11 @@ async def analyze_text(request: AnalyzeRequest, req: Request):
 
 
 @app.get("/history", tags=["History"])
-async def get_history(limit: int = 10):
+async def get_history(
+    limit: int = 10,
+    prediction: Optional[str] = None,
+    model_version: Optional[str] = None
+):
     """
     Retrieve recent prediction history.
     
@@ -207,6 +329,8 @@ async def get_history(limit: int = 10):
     
     Args:
         limit: Maximum number of predictions to return (default: 10, max: 50)
+        prediction: Optional label filter ("Real", "Fake" or "Uncertain")
+        model_version: Optional model version filter
     """
     # Validate limit
     if limit < 1:
@@ -222,13 +346,17 @@ async def get_history(limit: int = 10):
         )
     
     try:
-        predictions = await mongodb.get_recent_predictions(limit=limit)
+        predictions = await mongodb.get_recent_predictions(
+            limit=limit,
+            prediction=prediction,
+            model_version=model_version
+        )
         return {
             "count": len(predictions),
             "predictions": predictions
         }
     except Exception as e:
-        logger.error(f"Error fetching history: {str(e)}")
+        logger.error("Error fetching history: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to retrieve prediction history."
@@ -7,20 +7,34 @@ predictions, reducing false positives without retraining the model.
 
 Model Loading Strategy:
 1. Check if model exists locally
-2. If not, download from S3 (production)
-3. If S3 fails, fail fast with clear error
+2. If not, download from S3 (production, when S3_BUCKET is set)
+3. If S3 is not configured or fails, fail fast with clear error
+4. Export to an INT8 ONNX Runtime graph (cached on disk), falling back
+   to PyTorch dynamic quantization if ONNX Runtime is unavailable
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Tuple, Dict, Any
-import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import metadata
+from typing import Tuple, Dict, Any, List, Optional, Union
 import os
 from pathlib import Path
 
+import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
 
-from .config import MODEL_PATH, LABEL_MAP, S3_BUCKET, S3_MODEL_KEY, AWS_REGION
+from .config import (
+    MODEL_PATH, LABEL_MAP, S3_BUCKET, S3_MODEL_KEY, AWS_REGION,
+    INFERENCE_BACKEND, ONNX_MODEL_DIR, USE_IPEX_BF16, USE_TORCHSCRIPT, DISABLE_QUANT, INFERENCE_CACHE_SIZE, PREPROCESS_CACHE_SIZE, INFERENCE_NUM_THREADS,
+    BATCH_WINDOW_MS, BATCH_MAX_SIZE, FAST_MODEL_PATH, FAST_MODEL_THRESHOLD
+)
 from .utils import clean_text, truncate_text
 
 
@@ -32,6 +46,33 @@ CONFIDENCE_HIGH = 0.90      # Trust model output completely
 CONFIDENCE_MEDIUM = 0.60    # Uncertain zone begins
 MINIMUM_TEXT_LENGTH = 10    # Minimum characters after cleaning
 
+# Validation error messages (built once, not per failed request)
+ERROR_NOT_STRING = "Input must be a non-empty string"
+ERROR_WHITESPACE = "Text contains only whitespace"
+ERROR_TOO_SHORT = f"Text too short (minimum {MINIMUM_TEXT_LENGTH} characters)"
+ERROR_EMPTY_AFTER_CLEANING = "Text is empty or too short after preprocessing"
+ERROR_NOT_LOADED = "Model is not loaded. Call load() first."
+
+# Padded sequence lengths; a fixed set of shapes keeps traced/ONNX graphs warm
+SEQ_LEN_BUCKETS = (32, 64, 128, 256, 512)
+
+# Parallel S3 model download (files in flight, multipart part size)
+S3_DOWNLOAD_WORKERS = 16
+S3_MULTIPART_CHUNK = 8 * 1024 * 1024
+
+# File written by ORTQuantizer inside ONNX_MODEL_DIR, and the sentinel
+# describing which checkpoint/optimum/onnxruntime build it was made from
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+ONNX_SENTINEL_FILE = "onnx_sentinel.json"
+
+# Quantized + traced PyTorch model saved inside MODEL_PATH, and the
+# sentinel describing which checkpoint/torch build it was made from
+TS_SNAPSHOT_FILE = "model.quant.ts"
+TS_SENTINEL_FILE = "sentinel.json"
+
+# Read size when hashing weight files for model_fingerprint
+FINGERPRINT_CHUNK = 1024 * 1024
+
 
 def download_model_from_s3(local_path: str, s3_bucket: str, s3_key: str, region: str) -> bool:
     """
@@ -54,14 +95,27 @@ def download_model_from_s3(local_path: str, s3_bucket: str, s3_key: str, region:
     """
     try:
         import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
         from botocore.exceptions import ClientError, NoCredentialsError
         
-        logger.info(f"Model not found locally. Downloading from S3...")
-        logger.info(f"S3 Location: s3://{s3_bucket}/{s3_key}/")
-        logger.info(f"Local Path: {local_path}")
+        logger.info("Model not found locally. Downloading from S3...")
+        logger.info("S3 Location: s3://%s/%s/", s3_bucket, s3_key)
+        logger.info("Local Path: %s", local_path)
         
         # Create S3 client (uses IAM role or environment credentials)
-        s3_client = boto3.client('s3', region_name=region)
+        # Pool sized for every file download running multipart GETs at once
+        s3_client = boto3.client(
+            's3',
+            region_name=region,
+            config=Config(max_pool_connections=2 * S3_DOWNLOAD_WORKERS)
+        )
+        transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_CHUNK,
+            multipart_chunksize=S3_MULTIPART_CHUNK,
+            max_concurrency=S3_DOWNLOAD_WORKERS,
+            use_threads=True
+        )
         
         # Create local directory if it doesn't exist
         Path(local_path).mkdir(parents=True, exist_ok=True)
@@ -73,19 +127,17 @@ def download_model_from_s3(local_path: str, s3_bucket: str, s3_key: str, region:
             logger.error("AWS credentials not found. Ensure the EC2 instance has the correct IAM Role attached.")
             return False
         except ClientError as e:
-            logger.error(f"Failed to list S3 objects (Check IAM Role permissions): {e}")
+            logger.error("Failed to list S3 objects (Check IAM Role permissions): %s", e)
             return False
         
         if 'Contents' not in response:
-            logger.error(f"No files found in s3://{s3_bucket}/{s3_key}/")
+            logger.error("No files found in s3://%s/%s/", s3_bucket, s3_key)
             return False
         
-        # Download each file
-        files_downloaded = 0
+        # Plan downloads (skip directory markers)
+        downloads = []
         for obj in response['Contents']:
             s3_file_key = obj['Key']
-            
-            # Skip directory markers
             if s3_file_key.endswith('/'):
                 continue
             
@@ -95,27 +147,170 @@ def download_model_from_s3(local_path: str, s3_bucket: str, s3_key: str, region:
             
             # Create subdirectories if needed
             os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-            
-            # Download file
-            logger.info(f"Downloading: {s3_file_key} -> {local_file_path}")
+            downloads.append((s3_file_key, local_file_path))
+        
+        def _download(item: Tuple[str, str]) -> Tuple[str, Optional[Exception]]:
+            s3_file_key, local_file_path = item
+            logger.info("Downloading: %s -> %s", s3_file_key, local_file_path)
             try:
-                s3_client.download_file(s3_bucket, s3_file_key, local_file_path)
-                files_downloaded += 1
+                s3_client.download_file(
+                    s3_bucket, s3_file_key, local_file_path, Config=transfer_config
+                )
+                return s3_file_key, None
             except ClientError as e:
-                logger.error(f"Failed to download {s3_file_key}: {e}")
+                return s3_file_key, e
+        
+        # OPTIMIZATION: Download files concurrently; large weights also
+        # split into ranged multipart GETs by the transfer manager
+        with ThreadPoolExecutor(max_workers=S3_DOWNLOAD_WORKERS) as pool:
+            results = list(pool.map(_download, downloads))
+        
+        for s3_file_key, error in results:
+            if error is not None:
+                logger.error("Failed to download %s: %s", s3_file_key, error)
                 return False
         
-        logger.info(f"✓ Model download complete! Downloaded {files_downloaded} files from S3.")
+        logger.info("✓ Model download complete! Downloaded %s files from S3.", len(results))
         return True
         
     except ImportError:
         logger.error("boto3 not installed. Run: pip install boto3")
         return False
     except Exception as e:
-        logger.error(f"Unexpected error during S3 download: {e}")
+        logger.error("Unexpected error during S3 download: %s", e)
         return False
 
 
+def _package_version(name: str) -> Optional[str]:
+    """Installed version of a distribution, or None if it is missing."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def build_onnx_session(model_path: str, onnx_dir: str):
+    """
+    Build an ONNX Runtime session for an INT8-quantized export of the model.
+    
+    The first call exports the Hugging Face checkpoint to ONNX and applies
+    dynamic INT8 quantization; the result is cached in onnx_dir so later
+    cold starts only create the session. A sentinel next to the export
+    records the checkpoint fingerprint and optimum/onnxruntime versions,
+    and the export is rebuilt when any of them changes. ONNX Runtime's graph optimizer
+    fuses Attention/LayerNorm/GELU into single kernels.
+    
+    Args:
+        model_path: Directory containing the Hugging Face checkpoint
+        onnx_dir: Directory to cache the exported/quantized graph
+    
+    Returns:
+        onnxruntime.InferenceSession, or None if ONNX Runtime is unavailable
+        or the export fails
+    """
+    try:
+        import onnxruntime as ort
+        
+        quantized_path = Path(onnx_dir) / ONNX_QUANTIZED_FILE
+        sentinel_path = Path(onnx_dir) / ONNX_SENTINEL_FILE
+        sentinel = {
+            "model_hash": model_fingerprint(model_path),
+            "optimum_version": _package_version("optimum"),
+            "onnxruntime_version": ort.__version__,
+        }
+        cached = quantized_path.exists() and sentinel_path.exists()
+        if cached and json.loads(sentinel_path.read_text()) != sentinel:
+            logger.info("Cached ONNX model is stale, re-exporting")
+            cached = False
+        
+        if not cached:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            logger.info("Exporting model to ONNX: %s", onnx_dir)
+            ort_model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True)
+            ort_model.save_pretrained(onnx_dir)
+            
+            logger.info("Applying ONNX Runtime dynamic INT8 quantization...")
+            quantizer = ORTQuantizer.from_pretrained(ort_model)
+            quantizer.quantize(
+                save_dir=onnx_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            # Sentinel written last: it only exists next to a complete export
+            sentinel_path.write_text(json.dumps(sentinel))
+        else:
+            logger.info("✓ Using cached ONNX model: %s", quantized_path)
+        
+        sess_options = ort.SessionOptions()
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # Match the per-worker thread budget used for PyTorch
+        sess_options.intra_op_num_threads = INFERENCE_NUM_THREADS
+        sess_options.inter_op_num_threads = 1
+        
+        return ort.InferenceSession(
+            str(quantized_path), sess_options, providers=["CPUExecutionProvider"]
+        )
+        
+    except ImportError:
+        logger.warning("onnxruntime/optimum not installed. Run: pip install optimum[onnxruntime]")
+        return None
+    except Exception as e:
+        logger.warning("ONNX export/session creation failed: %s", e)
+        return None
+
+
+def model_fingerprint(model_path: str) -> str:
+    """
+    Content identity of the checkpoint in model_path.
+    
+    Hashes config.json and the bytes of every weight file. Metadata such
+    as mtime is deliberately ignored: pods re-download the model into an
+    emptyDir on every start, and derived exports must stay valid across
+    identical downloads. model_training/train.py mirrors this function
+    so the ONNX export shipped with the model passes the sentinel check.
+    
+    Args:
+        model_path: Directory containing the HuggingFace checkpoint
+        
+    Returns:
+        Hex digest identifying the checkpoint
+    """
+    path = Path(model_path)
+    digest = hashlib.sha256((path / "config.json").read_bytes())
+    for weights in sorted(path.glob("*.bin")) + sorted(path.glob("*.safetensors")):
+        digest.update(weights.name.encode())
+        with open(weights, "rb") as f:
+            for chunk in iter(lambda: f.read(FINGERPRINT_CHUNK), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def top_classes(logits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top class and its softmax probability for each row of logits.
+    
+    Args:
+        logits: Array of shape (batch, num_labels)
+        
+    Returns:
+        Tuple of (predicted_class, confidence) arrays of shape (batch,)
+    """
+    # Softmax is monotonic: the top class comes straight from the logits
+    rows = np.arange(len(logits))
+    predicted = logits.argmax(axis=-1)
+    
+    if logits.shape[-1] == 2:
+        # Two classes: softmax of the top class == sigmoid of the margin
+        margin = logits[rows, predicted] - logits[rows, 1 - predicted]
+        confidences = 1.0 / (1.0 + np.exp(-margin))
+    else:
+        exp_logits = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        confidences = exp_logits[rows, predicted] / exp_logits.sum(axis=-1)
+    return predicted, confidences
+
+
 class FakeNewsClassifier:
     """
     Wrapper class for the fake news detection BERT model.
@@ -124,34 +319,364 @@ class FakeNewsClassifier:
     a production-ready prediction interface with confidence-aware logic.
     """
     
-    _instance = None
+    def __init__(self):
+        self.model: AutoModelForSequenceClassification = None
+        self.tokenizer: AutoTokenizer = None
+        self.session = None  # ONNX Runtime session (replaces self.model when set)
+        self._onnx_input_names: Tuple[str, ...] = ()
+        self._use_bf16: bool = False  # Run PyTorch forward under BF16 autocast
+        self._quantized: bool = False  # self.model has dynamic INT8 Linear layers
+        self._traced: bool = False  # self.model is a frozen TorchScript module
+        self.fast_model: AutoModelForSequenceClassification = None  # Cascade first stage
+        self.fast_tokenizer: AutoTokenizer = None
+        self._fast_total: int = 0  # Inputs seen by the fast model
+        self._fast_escalated: int = 0  # ... of which went on to the full model
+        self.device: str = "cpu"  # Force CPU for free-tier compatibility
+        self._is_loaded: bool = False
+        # Per-instance cache so entries never outlive the loaded model
+        self._infer_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        # Keyed by a 16-byte digest of the raw text, not the full article
+        self._prep_cache: "OrderedDict[bytes, Tuple[str, bool]]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # Batcher worker thread shares the caches
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def _tokenize(self, text: Union[str, List[str]], max_length: int, tokenizer=None):
+        """
+        Tokenize and pad up to the nearest length in SEQ_LEN_BUCKETS.
+        
+        Args:
+            text: Cleaned input text, or a list of texts
+            max_length: Maximum sequence length in tokens
+            tokenizer: Tokenizer to use (defaults to the main model's)
+            
+        Returns:
+            BatchEncoding of 2-D numpy arrays with a bucketed sequence length
+        """
+        tokenizer = tokenizer or self.tokenizer
+        if isinstance(text, str):
+            # Always batch so every backend gets (batch, seq_len) arrays
+            text = [text]
+        encoded = tokenizer(text, truncation=True, max_length=max_length)
+        length = max(map(len, encoded["input_ids"]))
+        bucket = next((b for b in SEQ_LEN_BUCKETS if b >= length), max_length)
+        return tokenizer.pad(
+            encoded, padding="max_length", max_length=bucket, return_tensors="np"
+        )
+            
+    def _run_model(self, text: Union[str, List[str]], max_length: int = 512) -> np.ndarray:
+        """
+        Tokenize text and run a forward pass on the active backend.
+        
+        Args:
+            text: Cleaned input text, or a list of texts (padded to a shared bucket)
+            max_length: Maximum sequence length in tokens
+            
+        Returns:
+            Logits array of shape (batch, num_labels)
+        """
+        inputs = self._tokenize(text, max_length)
+        
+        if self.session is not None:
+            feeds = {
+                name: inputs[name].astype(np.int64, copy=False)
+                for name in self._onnx_input_names
+            }
+            return self.session.run(None, feeds)[0]
+        
+        # Zero-copy views over the numpy buffers (moved only off-CPU)
+        inputs = {k: torch.from_numpy(v) for k, v in inputs.items()}
+        if self.device != "cpu":
+            inputs = {k: v.to(self.device, non_blocking=True) for k, v in inputs.items()}
+        
+        with torch.no_grad(), torch.cpu.amp.autocast(
+            enabled=self._use_bf16, dtype=torch.bfloat16, cache_enabled=False
+        ):
+            if self._traced:
+                # Traced graph takes positional tensors and returns a tuple
+                logits = self.model(inputs["input_ids"], inputs["attention_mask"])[0]
+            else:
+                logits = self.model(**inputs).logits
+        return logits.float().cpu().numpy()
     
-    def __init__(self):
-        if not hasattr(self, '_initialized'):
-            self.model: AutoModelForSequenceClassification = None
-            self.tokenizer: AutoTokenizer = None
-            self.device: str = "cpu"  # Force CPU for free-tier compatibility
-            self._is_loaded: bool = False
-            self._initialized = True
-            
-    def _warmup(self):
-        """Run a dummy prediction to initialize lazy layers."""
+    def _run_fast_model(self, texts: List[str], max_length: int = 512) -> np.ndarray:
+        """
+        Tokenize texts and run a forward pass on the cascade's fast model.
+        
+        Args:
+            texts: Cleaned input texts
+            max_length: Maximum sequence length in tokens
+            
+        Returns:
+            Logits array of shape (batch, num_labels)
+        """
+        inputs = self._tokenize(texts, max_length, tokenizer=self.fast_tokenizer)
+        inputs = {k: torch.from_numpy(v) for k, v in inputs.items()}
+        if self.device != "cpu":
+            inputs = {k: v.to(self.device, non_blocking=True) for k, v in inputs.items()}
+        
+        with torch.no_grad():
+            logits = self.fast_model(**inputs).logits
+        return logits.float().cpu().numpy()
+    
+    def _infer_batch(self, cleaned_texts: List[str]) -> List[Tuple[int, float]]:
+        """
+        Run one forward pass over a batch and return the top class per row.
+        
+        With a fast model loaded, the batch goes through it first and only
+        rows below FAST_MODEL_THRESHOLD are escalated to the full model.
+        
+        Args:
+            cleaned_texts: Preprocessed input texts
+            
+        Returns:
+            List of (predicted_class, confidence), one per input
+        """
+        if self.fast_model is None:
+            predicted, confidences = top_classes(self._run_model(cleaned_texts))
+            return [(int(c), float(p)) for c, p in zip(predicted, confidences)]
+        
+        predicted, confidences = top_classes(self._run_fast_model(cleaned_texts))
+        results = [(int(c), float(p)) for c, p in zip(predicted, confidences)]
+        
+        escalate = [i for i, p in enumerate(confidences) if p < FAST_MODEL_THRESHOLD]
+        if escalate:
+            predicted, confidences = top_classes(
+                self._run_model([cleaned_texts[i] for i in escalate])
+            )
+            for i, c, p in zip(escalate, predicted, confidences):
+                results[i] = (int(c), float(p))
+        
+        self._fast_total += len(cleaned_texts)
+        self._fast_escalated += len(escalate)
+        logger.debug(
+            "Cascade escalation rate: %.2f%% (%d/%d)",
+            100 * self._fast_escalated / self._fast_total,
+            self._fast_escalated, self._fast_total
+        )
+        return results
+    
+    def _infer_cached(self, cleaned_texts: List[str]) -> List[Tuple[int, float]]:
+        """
+        _infer_batch behind a per-instance LRU cache of results.
+        
+        Cache hits are answered directly; only the distinct misses go
+        through one _infer_batch call, and their results are stored, so
+        repeated submissions skip tokenization and the forward pass on
+        both the single and the batched path.
+        
+        Args:
+            cleaned_texts: Preprocessed input texts
+            
+        Returns:
+            List of (predicted_class, confidence), one per input
+        """
+        cache = self._infer_cache
+        results: List[Optional[Tuple[int, float]]] = [None] * len(cleaned_texts)
+        misses: Dict[str, List[int]] = {}
+        with self._cache_lock:
+            for i, text in enumerate(cleaned_texts):
+                hit = cache.get(text)
+                if hit is None:
+                    misses.setdefault(text, []).append(i)
+                else:
+                    cache.move_to_end(text)
+                    results[i] = hit
+        if not misses:
+            return results
+        
+        computed = self._infer_batch(list(misses))
+        with self._cache_lock:
+            for (text, positions), result in zip(misses.items(), computed):
+                for i in positions:
+                    results[i] = result
+                if INFERENCE_CACHE_SIZE > 0:
+                    cache[text] = result
+                    if len(cache) > INFERENCE_CACHE_SIZE:
+                        cache.popitem(last=False)
+        return results
+    
+    def _load_fast_model(self) -> bool:
+        """
+        Load the optional cascade first stage from FAST_MODEL_PATH.
+        
+        The fast model must have the same labels as the main model and
+        LABEL_MAP; otherwise the cascade stays disabled.
+        
+        Returns:
+            True if the fast model is ready, False to run the full model only
+        """
         try:
-            logger.info("Warming up model...")
-            dummy_text = "This is a warmup sentence to initialize the model."
-            inputs = self.tokenizer(
-                dummy_text, return_tensors="pt", truncation=True, max_length=64, padding=True
+            logger.info("Loading fast cascade model from: %s", FAST_MODEL_PATH)
+            # Cascade results are only interchangeable if both models share a label space
+            fast_config = AutoConfig.from_pretrained(FAST_MODEL_PATH)
+            main_config = AutoConfig.from_pretrained(MODEL_PATH)
+            if (
+                fast_config.num_labels != main_config.num_labels
+                or fast_config.num_labels != len(LABEL_MAP)
+                or fast_config.id2label != main_config.id2label
+            ):
+                logger.warning(
+                    "Fast cascade model labels %s do not match the main model %s, "
+                    "using full model only",
+                    fast_config.id2label, main_config.id2label
+                )
+                return False
+            self.fast_tokenizer = AutoTokenizer.from_pretrained(FAST_MODEL_PATH, use_fast=True)
+            fast_model = AutoModelForSequenceClassification.from_pretrained(
+                FAST_MODEL_PATH, config=fast_config
+            )
+            try:
+                fast_model = torch.quantization.quantize_dynamic(
+                    fast_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            except Exception as qe:
+                logger.warning("Fast model quantization failed, using full precision: %s", qe)
+            fast_model.eval()
+            self.fast_model = fast_model
+            self._run_fast_model(["This is a warmup sentence to initialize the model."])
+            logger.info("✓ Fast cascade enabled (threshold: %s)", FAST_MODEL_THRESHOLD)
+            return True
+        except Exception as e:
+            logger.warning("Failed to load fast cascade model, using full model only: %s", e)
+            self.fast_model = None
+            self.fast_tokenizer = None
+            return False
+    
+    def _apply_ipex_bf16(self) -> bool:
+        """
+        Optimize the eval-mode model with Intel Extension for PyTorch (BF16).
+        
+        Returns:
+            True if IPEX was applied, False if unavailable or it failed
+        """
+        try:
+            import intel_extension_for_pytorch as ipex
+            
+            logger.info("Applying IPEX BF16 optimization...")
+            example = self.tokenizer("x " * 32, return_tensors="pt")
+            self.model = ipex.optimize(
+                self.model,
+                dtype=torch.bfloat16,
+                sample_input=(example["input_ids"], example["attention_mask"])
+            )
+            return True
+        except ImportError:
+            logger.warning("intel_extension_for_pytorch not installed, using FP32")
+            return False
+        except Exception as e:
+            logger.warning("IPEX optimization failed, using FP32: %s", e)
+            return False
+    
+    def _trace_model(self) -> bool:
+        """
+        Replace the eager model with a frozen TorchScript trace.
+        
+        Removes Python dispatch overhead from every forward pass. The model
+        must have been loaded with torchscript=True so it returns tuples.
+        The trace is run at every bucket length before it replaces the
+        eager model.
+        
+        Returns:
+            True if tracing succeeded, False to keep the eager model
+        """
+        try:
+            logger.info("Tracing model with TorchScript...")
+            example = self.tokenizer(
+                "warm " * 64, return_tensors="pt", padding="max_length",
+                max_length=128, truncation=True
             )
-            with torch.no_grad():
-                self.model(**inputs)
+            with torch.no_grad(), torch.cpu.amp.autocast(
+                enabled=self._use_bf16, dtype=torch.bfloat16, cache_enabled=False
+            ):
+                traced = torch.jit.trace(
+                    self.model, (example["input_ids"], example["attention_mask"]), strict=False
+                )
+            traced = torch.jit.freeze(traced)
+        except Exception as e:
+            logger.warning("TorchScript tracing failed, using eager model: %s", e)
+            return False
+        
+        # A shape-specialised trace would only fail on the first long
+        # article; keep the eager model unless every bucket runs
+        eager, self.model, self._traced = self.model, traced, True
+        try:
+            self._check_buckets()
+            return True
+        except Exception as e:
+            logger.warning("Traced model failed on a bucket shape, using eager model: %s", e)
+            self.model, self._traced = eager, False
+            return False
+    
+    def _check_buckets(self):
+        """Run one forward pass at every length in SEQ_LEN_BUCKETS (raises on failure)."""
+        with torch.jit.optimized_execution(True):
+            for max_length in SEQ_LEN_BUCKETS:
+                self._run_model(["warm " * max_length], max_length=max_length)
+    
+    def _snapshot_sentinel(self) -> Dict[str, str]:
+        """Sentinel contents a snapshot must match to be reused."""
+        return {
+            "model_hash": model_fingerprint(MODEL_PATH),
+            "torch_version": torch.__version__,
+            "quantized": self._quantized,
+            "bf16": self._use_bf16,
+        }
+    
+    def _load_snapshot(self) -> bool:
+        """
+        Load the saved TorchScript snapshot if it matches the checkpoint.
+        
+        Returns:
+            True if self.model is now the snapshot, False otherwise
+        """
+        model_path = Path(MODEL_PATH)
+        sentinel_path = model_path / TS_SENTINEL_FILE
+        snapshot_path = model_path / TS_SNAPSHOT_FILE
+        if not (sentinel_path.exists() and snapshot_path.exists()):
+            return False
+        
+        try:
+            if json.loads(sentinel_path.read_text()) != self._snapshot_sentinel():
+                logger.info("TorchScript snapshot is stale, rebuilding")
+                return False
+            self.model = torch.jit.load(str(snapshot_path), map_location=self.device)
+            self._traced = True
+            self._check_buckets()
+            return True
+        except Exception as e:
+            logger.warning("Failed to load TorchScript snapshot: %s", e)
+            return False
+    
+    def _save_snapshot(self):
+        """Save the traced model so later starts skip load/quantize/trace."""
+        model_path = Path(MODEL_PATH)
+        try:
+            torch.jit.save(self.model, str(model_path / TS_SNAPSHOT_FILE))
+            # Sentinel written last: it only exists next to a complete snapshot
+            (model_path / TS_SENTINEL_FILE).write_text(json.dumps(self._snapshot_sentinel()))
+            logger.info("Saved TorchScript snapshot to %s", model_path / TS_SNAPSHOT_FILE)
+        except Exception as e:
+            logger.warning("Failed to save TorchScript snapshot (non-critical): %s", e)
+    
+    def _warmup(self, rounds: int = 3):
+        """
+        Run dummy predictions to initialize lazy layers.
+        
+        Runs every length in SEQ_LEN_BUCKETS once, so each specialized
+        graph exists before real traffic. TorchScript profiles the first
+        runs of a traced model and re-optimizes, so it gets several runs
+        per bucket here rather than on the first real requests.
+        """
+        try:
+            logger.info("Warming up model...")
+            dummy_text = "This is a warmup sentence to initialize the model. " * 64
+            runs = rounds if self._traced else 1
+            with torch.jit.optimized_execution(True):
+                for max_length in SEQ_LEN_BUCKETS:
+                    for _ in range(runs):
+                        self._run_model([dummy_text], max_length=max_length)
             logger.info("Warmup complete.")
         except Exception as e:
-            logger.warning(f"Warmup failed (non-critical): {e}")
+            logger.warning("Warmup failed (non-critical): %s", e)
     
     def load(self) -> bool:
         """
@@ -159,9 +684,11 @@ class FakeNewsClassifier:
         
         Strategy:
         1. Check if model exists locally
-        2. If not, download from S3
-        3. Load model into memory
-        4. Apply optimizations (quantization, warmup)
+        2. If not, download from S3 (when S3_BUCKET is configured)
+        3. Load model into memory (ONNX Runtime INT8, a saved TorchScript
+           snapshot, or PyTorch)
+        4. Apply optimizations (quantization, tracing, warmup) and snapshot
+           the traced PyTorch model for the next start
         
         Returns:
             True if loading was successful, False otherwise
@@ -175,8 +702,13 @@ class FakeNewsClassifier:
             )
             
             # Step 2: Download from S3 if model doesn't exist locally
+            if not model_exists and not S3_BUCKET:
+                logger.error("❌ FATAL: Model not found at %s and S3_BUCKET is not set.", MODEL_PATH)
+                self._is_loaded = False
+                return False
+            
             if not model_exists:
-                logger.warning(f"Model not found at: {MODEL_PATH}")
+                logger.warning("Model not found at: %s", MODEL_PATH)
                 logger.info("Attempting to download model from S3...")
                 
                 # Download model from S3
@@ -191,47 +723,108 @@ class FakeNewsClassifier:
                     logger.error("❌ FATAL: Model download from S3 failed.")
                     logger.error("Please ensure:")
                     logger.error("  1. AWS credentials are configured (IAM role or env vars)")
-                    logger.error(f"  2. S3 bucket '{S3_BUCKET}' exists and is accessible")
-                    logger.error(f"  3. Model files exist at s3://{S3_BUCKET}/{S3_MODEL_KEY}/")
+                    logger.error("  2. S3 bucket '%s' exists and is accessible", S3_BUCKET)
+                    logger.error("  3. Model files exist at s3://%s/%s/", S3_BUCKET, S3_MODEL_KEY)
                     self._is_loaded = False
                     return False
                 
                 logger.info("✓ Model downloaded successfully from S3")
             else:
-                logger.info(f"✓ Model found locally at: {MODEL_PATH}")
+                logger.info("✓ Model found locally at: %s", MODEL_PATH)
             
             # Step 3: Load model and tokenizer
-            logger.info(f"Loading model from: {MODEL_PATH}")
-            logger.info(f"Using device: {self.device}")
+            logger.info("Loading model from: %s", MODEL_PATH)
+            logger.info("Using device: %s", self.device)
+            
+            # OPTIMIZATION: Pin CPU threads per worker process
+            torch.set_num_threads(INFERENCE_NUM_THREADS)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Can only be set once, before any inter-op work has started
+                pass
+            logger.info("Using %s intra-op threads", INFERENCE_NUM_THREADS)
             
-            # Load tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+            # Load tokenizer (Rust-backed fast tokenizer, never the Python one)
+            self.tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, use_fast=True)
             
-            # Load model
-            self.model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+            # OPTIMIZATION: ONNX Runtime INT8 graph (fused kernels, INT8 GEMM)
+            if INFERENCE_BACKEND == "onnx":
+                self.session = build_onnx_session(MODEL_PATH, ONNX_MODEL_DIR)
+                if self.session is not None:
+                    self._onnx_input_names = tuple(i.name for i in self.session.get_inputs())
+                    logger.info("✓ Using ONNX Runtime INT8 backend")
+                else:
+                    logger.warning("Falling back to PyTorch backend")
             
-            # OPTIMIZATION: Dynamic Quantization for CPU
-            # Reduces memory usage by ~40% and improves inference speed
-            try:
-                logger.info("Applying dynamic quantization...")
-                self.model = torch.quantization.quantize_dynamic(
-                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+            # OPTIMIZATION: Reuse the quantized + traced snapshot from a
+            # previous start (not for IPEX BF16, whose graph needs IPEX ops)
+            use_snapshot = USE_TORCHSCRIPT and not USE_IPEX_BF16
+            # Dynamic quantization is skipped off-CPU, for IPEX BF16, which
+            # needs the float Linear layers, and when DISABLE_QUANT=1
+            quantize = self.device == "cpu" and not USE_IPEX_BF16 and not DISABLE_QUANT
+            from_snapshot = False
+            if self.session is None and use_snapshot:
+                # Only reuse a snapshot built the way this start would build it
+                self._quantized = quantize
+                from_snapshot = self._traced = self._load_snapshot()
+                if from_snapshot:
+                    logger.info("✓ Loaded TorchScript snapshot")
+            
+            if self.session is None and not from_snapshot:
+                # Load model (tuple outputs when it is going to be traced)
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    MODEL_PATH, torchscript=USE_TORCHSCRIPT
                 )
-            except Exception as qe:
-                logger.warning(f"Quantization failed, using full precision: {qe}")
+                
+                # OPTIMIZATION: Dynamic Quantization for CPU
+                # Reduces memory usage by ~40% and improves inference speed
+                if quantize:
+                    try:
+                        logger.info("Applying dynamic quantization...")
+                        self.model = torch.quantization.quantize_dynamic(
+                            self.model, {torch.nn.Linear}, dtype=torch.qint8
+                        )
+                    except Exception as qe:
+                        logger.warning("Quantization failed, using full precision: %s", qe)
+                        quantize = False
+                self._quantized = quantize
 
-            self.model.to(self.device)
-            self.model.eval()  # Set to evaluation mode
+                self.model.to(self.device)
+                self.model.eval()  # Set to evaluation mode
+                
+                # OPTIMIZATION: IPEX BF16 kernels + autocast
+                if USE_IPEX_BF16:
+                    self._use_bf16 = self._apply_ipex_bf16()
+                
+                precision = "BF16 (IPEX)" if self._use_bf16 else "INT8 dynamic" if quantize else "FP32"
+                logger.info("PyTorch precision path: %s", precision)
+                
+                # OPTIMIZATION: TorchScript trace + freeze
+                if USE_TORCHSCRIPT:
+                    self._traced = self._trace_model()
             
             # OPTIMIZATION: Warmup
             self._warmup()
             
+            if use_snapshot and self._traced and not from_snapshot:
+                self._save_snapshot()
+            
+            # OPTIMIZATION: Cheap first-stage model for confident inputs
+            if FAST_MODEL_PATH:
+                self._load_fast_model()
+            
+            # Drop results computed by any previously loaded model
+            with self._cache_lock:
+                self._infer_cache.clear()
+                self._prep_cache.clear()
+            
             self._is_loaded = True
             logger.info("✓ Model loaded successfully and ready for inference!")
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to load model: {str(e)}")
+            logger.error("❌ Failed to load model: %s", e)
             self._is_loaded = False
             return False
     
@@ -250,16 +843,17 @@ class FakeNewsClassifier:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not text or not isinstance(text, str):
-            return False, "Input must be a non-empty string"
+        if not isinstance(text, str) or not text:
+            return False, ERROR_NOT_STRING
         
-        # Check if text is too short (likely just a headline or fragment)
-        if len(text.strip()) < MINIMUM_TEXT_LENGTH:
-            return False, f"Text too short (minimum {MINIMUM_TEXT_LENGTH} characters)"
+        # Strip once and reuse for both checks
+        stripped = text.strip()
+        if not stripped:
+            return False, ERROR_WHITESPACE
         
-        # Check if text is only whitespace
-        if not text.strip():
-            return False, "Text contains only whitespace"
+        # Check if text is too short (likely just a headline or fragment)
+        if len(stripped) < MINIMUM_TEXT_LENGTH:
+            return False, ERROR_TOO_SHORT
         
         return True, ""
     
@@ -276,7 +870,7 @@ class FakeNewsClassifier:
             True if likely a headline, False otherwise
         """
         # Count sentences (rough heuristic: periods, exclamation, question marks)
-        sentence_endings = len(re.findall(r'[.!?]', text))
+        sentence_endings = text.count('.') + text.count('!') + text.count('?')
         word_count = len(text.split())
         
         # If very short and no sentence structure, likely a headline
@@ -318,61 +912,177 @@ class FakeNewsClassifier:
             ValueError: If input validation fails
         """
         if not self._is_loaded:
-            raise RuntimeError("Model is not loaded. Call load() first.")
+            raise RuntimeError(ERROR_NOT_LOADED)
+        
+        # Step 1-3: Validate, preprocess, detect headline-only input
+        cleaned_text, is_headline = self._preprocess(text)
+        
+        # Step 4-7: Model inference and confidence-aware decision logic
+        return self._predict_cleaned(cleaned_text, is_headline)
+    
+    def _predict_cleaned(self, cleaned_text: str, is_headline: bool) -> Tuple[str, float]:
+        """
+        Classify text already passed through _preprocess.
+        
+        Args:
+            cleaned_text: Preprocessed input text
+            is_headline: Whether input appears to be headline-only
+            
+        Returns:
+            Tuple of (prediction_label, confidence_score)
+        """
+        # Tokenize and run model inference (cached for repeat inputs)
+        predicted_class, confidence = self._infer_cached([cleaned_text])[0]
+        
+        # Map to label and apply confidence-aware decision logic
+        return self._finalize(predicted_class, confidence, is_headline)
+    
+    def predict_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Batched variant of predict_news_final.
+        
+        Tokenizes all texts together (padded to the longest) and runs a
+        single forward pass, amortizing tokenizer and framework overhead.
+        
+        Args:
+            texts: News article texts to classify
+            
+        Returns:
+            List of (prediction_label, confidence_score), in input order
+            
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If any input fails validation
+        """
+        if not self._is_loaded:
+            raise RuntimeError(ERROR_NOT_LOADED)
+        
+        return self.predict_preprocessed([self._preprocess(text) for text in texts])
+    
+    def predict_preprocessed(self, items: List[Tuple[str, bool]]) -> List[Tuple[str, float]]:
+        """
+        Classify texts already passed through _preprocess in one forward pass.
         
-        # Step 1: Validate input
+        Args:
+            items: List of (cleaned_text, is_headline) tuples
+            
+        Returns:
+            List of (prediction_label, confidence_score), in input order
+        """
+        if not items:
+            return []
+        # Cache hits skip the forward pass; only misses are batched
+        results = self._infer_cached([cleaned_text for cleaned_text, _ in items])
+        return [
+            self._finalize(predicted_class, confidence, is_headline)
+            for (predicted_class, confidence), (_, is_headline) in zip(results, items)
+        ]
+    
+    def _preprocess(self, text: str) -> Tuple[str, bool]:
+        """
+        Validate and clean raw input text.
+        
+        Args:
+            text: Raw input text
+            
+        Returns:
+            Tuple of (cleaned_text, is_headline)
+            
+        Raises:
+            ValueError: If input validation fails
+        """
+        # Validate input
         is_valid, error_msg = self._validate_input(text)
         if not is_valid:
             raise ValueError(error_msg)
         
-        # Step 2: Preprocess text
-        cleaned_text = clean_text(text)
-        cleaned_text = truncate_text(cleaned_text)
+        # Preprocess text (cached for repeat inputs)
+        cleaned_text, is_headline = self._prep_cached(text)
         
         if not cleaned_text or len(cleaned_text) < MINIMUM_TEXT_LENGTH:
-            raise ValueError("Text is empty or too short after preprocessing")
-        
-        # Step 3: Check if input is headline-only (ambiguous)
-        is_headline = self._is_headline_only(cleaned_text)
-        
-        # Step 4: Tokenize
-        inputs = self.tokenizer(
-            cleaned_text,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512,
-            padding=True
-        )
+            raise ValueError(ERROR_EMPTY_AFTER_CLEANING)
+        
+        return cleaned_text, is_headline
+    
+    def _prep_cached(self, text: str) -> Tuple[str, bool]:
+        """
+        _prep behind a per-instance LRU cache keyed by a text digest.
         
-        # Move inputs to device
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        A 16-byte BLAKE2b digest stands in for the raw text, so the cache
+        holds PREPROCESS_CACHE_SIZE short keys instead of that many
+        complete submitted articles.
         
-        # Step 5: Model inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
+        Args:
+            text: Raw input text (already validated)
             
-            # Apply softmax to get probabilities
-            probabilities = torch.softmax(logits, dim=-1)
+        Returns:
+            Tuple of (cleaned_text, is_headline)
+        """
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cache = self._prep_cache
+        with self._cache_lock:
+            hit = cache.get(key)
+            if hit is not None:
+                cache.move_to_end(key)
+                return hit
+        
+        result = self._prep(text)
+        if PREPROCESS_CACHE_SIZE > 0:
+            with self._cache_lock:
+                cache[key] = result
+                if len(cache) > PREPROCESS_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return result
+    
+    def _prep(self, text: str) -> Tuple[str, bool]:
+        """
+        Clean and truncate text and flag headline-only input.
+        
+        Pure function of text, wrapped per instance by an LRU cache
+        (self._prep_cached).
+        
+        Args:
+            text: Raw input text (already validated)
             
-            # Get prediction and confidence
-            predicted_class = torch.argmax(probabilities, dim=-1).item()
-            confidence = probabilities[0][predicted_class].item()
+        Returns:
+            Tuple of (cleaned_text, is_headline)
+        """
+        cleaned_text = truncate_text(clean_text(text))
         
-        # Step 6: Map to label
+        # Check if input is headline-only (ambiguous)
+        return cleaned_text, self._is_headline_only(cleaned_text)
+    
+    def _finalize(
+        self,
+        predicted_class: int,
+        confidence: float,
+        is_headline: bool
+    ) -> Tuple[str, float]:
+        """
+        Map a raw model output to the final (label, confidence) result.
+        
+        Args:
+            predicted_class: Index of the top class
+            confidence: Probability of the top class
+            is_headline: Whether input appears to be headline-only
+            
+        Returns:
+            Tuple of (prediction_label, confidence rounded to 4 places)
+        """
+        # Map to label
         raw_prediction = LABEL_MAP.get(predicted_class, "Unknown")
         
-        # Step 7: Apply confidence-aware decision logic
+        # Apply confidence-aware decision logic
         final_prediction, final_confidence = self._apply_confidence_logic(
             raw_prediction, 
             confidence, 
             is_headline
         )
         
-        # Log prediction for monitoring
+        # Log prediction for monitoring (lazy %-args: formatted only if emitted)
         logger.info(
-            f"Prediction: {final_prediction} (confidence: {final_confidence:.4f}, "
-            f"raw: {raw_prediction}, is_headline: {is_headline})"
+            "Prediction: %s (confidence: %.4f, raw: %s, is_headline: %s)",
+            final_prediction, final_confidence, raw_prediction, is_headline
         )
         
         return final_prediction, round(final_confidence, 4)
@@ -422,20 +1132,44 @@ class FakeNewsClassifier:
             Dictionary with prediction, confidence, and metadata
         """
         if not self._is_loaded:
-            raise RuntimeError("Model is not loaded. Call load() first.")
+            raise RuntimeError(ERROR_NOT_LOADED)
         
-        # Validate and preprocess
-        is_valid, error_msg = self._validate_input(text)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        cleaned_text = clean_text(text)
-        is_headline = self._is_headline_only(cleaned_text)
+        # Validate and preprocess (once, shared with the prediction below)
+        cleaned_text, is_headline = self._preprocess(text)
         
         # Get prediction
-        prediction, confidence = self.predict_news_final(text)
+        prediction, confidence = self._predict_cleaned(cleaned_text, is_headline)
+        
+        return self._with_metadata(prediction, confidence, cleaned_text, is_headline)
+    
+    def predict_batch_with_metadata(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Batched variant of predict_with_metadata (one forward pass).
         
-        # Return with metadata
+        Args:
+            texts: News article texts to classify
+            
+        Returns:
+            List of dictionaries with prediction, confidence, and metadata
+            
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If any input fails validation
+        """
+        if not self._is_loaded:
+            raise RuntimeError(ERROR_NOT_LOADED)
+        
+        items = [self._preprocess(text) for text in texts]
+        return [
+            self._with_metadata(prediction, confidence, cleaned_text, is_headline)
+            for (prediction, confidence), (cleaned_text, is_headline)
+            in zip(self.predict_preprocessed(items), items)
+        ]
+    
+    def _with_metadata(
+        self, prediction: str, confidence: float, cleaned_text: str, is_headline: bool
+    ) -> Dict[str, Any]:
+        """Build the predict_with_metadata response for one input."""
         return {
             "prediction": prediction,
             "confidence": confidence,
@@ -466,5 +1200,111 @@ class FakeNewsClassifier:
         return self.predict_news_final(text)
 
 
-# Global classifier instance (initialized at startup)
+class PredictionBatcher:
+    """
+    Coalesces concurrent prediction requests into batched forward passes.
+    
+    Requests are validated and cleaned on the caller's side (so input
+    errors surface immediately), then queued. A background worker waits
+    up to window_ms after the first queued item, collects at most
+    max_batch items, and runs one predict_preprocessed call in a worker
+    thread so the event loop keeps accepting requests meanwhile.
+    """
+    
+    def __init__(self, clf: "FakeNewsClassifier", window_ms: int, max_batch: int):
+        self.classifier = clf
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if the batcher is running."""
+        return self._worker is not None
+    
+    def start(self):
+        """Start the background batching worker."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the worker, failing any requests still queued."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+    
+    async def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Queue a text for batched prediction and wait for its result.
+        
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If input validation fails
+        """
+        if not self.classifier.is_loaded:
+            raise RuntimeError(ERROR_NOT_LOADED)
+        
+        item = self.classifier._preprocess(text)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def _run(self):
+        """Collect queued requests into batches and resolve their futures."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.classifier.predict_preprocessed, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+# Process-wide classifier instance (constructed on import, loaded at startup)
 classifier = FakeNewsClassifier()
+
+
+@lru_cache(maxsize=1)
+def get_classifier() -> FakeNewsClassifier:
+    """
+    Return the process-wide classifier, loading it on first use.
+    
+    Shared by the API lifespan, tests and scripts so a process loads the
+    model at most once. Check is_loaded on the result: a failed load is
+    not retried.
+    """
+    if not classifier.is_loaded:
+        classifier.load()
+    return classifier
+
+# Global request batcher (started at startup when BATCH_WINDOW_MS > 0)
+batcher = PredictionBatcher(classifier, BATCH_WINDOW_MS, BATCH_MAX_SIZE)
@@ -6,6 +6,42 @@ Cleans and normalizes input text before model inference.
 import re
 import html
 
+try:
+    # Linear-time matching (no backtracking) on untrusted input
+    import re2
+except ImportError:
+    re2 = None
+
+
+def _compile_strip_re():
+    """
+    Compile the tag/URL/email pattern with re2 if installed, else re.
+    
+    RE2's \\S is ASCII-only, so the re2 build spells out Python's Unicode
+    whitespace set; otherwise a URL followed by e.g. a non-breaking space
+    would swallow the next word.
+    """
+    if re2 is None:
+        non_space = r'\S'
+        engine = re
+    else:
+        non_space = (
+            r'[^\t\n\x0b\x0c\r\x1c-\x1f \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}'
+            r'\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+        )
+        engine = re2
+    return engine.compile(
+        r'<[^>]+>'                                          # HTML tags
+        rf'|https?://{non_space}+|www\.{non_space}+'         # URLs
+        rf'|{non_space}+@{non_space}+'                       # Email addresses
+    )
+
+
+# Patterns compiled once at import instead of per clean_text call.
+# Tags, URLs and emails are all deleted, so they share one alternation
+# (one pass over the text instead of three).
+_STRIP_RE = _compile_strip_re()
+
 
 def clean_text(text: str) -> str:
     """
@@ -13,10 +49,8 @@ def clean_text(text: str) -> str:
     
     Performs the following operations:
     1. Decode HTML entities
-    2. Remove HTML tags
-    3. Remove URLs
-    4. Remove extra whitespace
-    5. Strip leading/trailing whitespace
+    2. Remove HTML tags, URLs and email addresses
+    3. Remove extra whitespace and strip leading/trailing whitespace
     
     Args:
         text: Raw input text from user
@@ -24,25 +58,16 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text ready for tokenization
     """
-    # Decode HTML entities (e.g., &amp; -> &)
-    text = html.unescape(text)
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Remove URLs
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    
-    # Remove email addresses
-    text = re.sub(r'\S+@\S+', '', text)
-    
-    # Remove extra whitespace (multiple spaces, tabs, newlines)
-    text = re.sub(r'\s+', ' ', text)
+    # Decode HTML entities (e.g., &amp; -> &); most submissions have none
+    if '&' in text:
+        text = html.unescape(text)
     
-    # Strip leading/trailing whitespace
-    text = text.strip()
+    # Remove HTML tags, URLs and email addresses in a single pass
+    text = _STRIP_RE.sub('', text)
     
-    return text
+    # Collapse whitespace runs (spaces, tabs, newlines) and strip the ends;
+    # str.split() does both in C, far cheaper than a \s+ regex on prose
+    return ' '.join(text.split())
 
 
 def truncate_text(text: str, max_length: int = 512) -> str:
@@ -0,0 +1,113 @@
+"""
+Tests for the MongoDB batched write queue.
+Uses an in-memory stand-in for the predictions collection.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+
+from backend.app import database
+from backend.app.database import MongoDB
+
+
+class FakeCollection:
+    """Records insert_many batches instead of talking to MongoDB."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def insert_many(self, documents, ordered=True):
+        self.batches.append(list(documents))
+
+
+def make_db(queue_size=100):
+    """MongoDB instance wired to a FakeCollection with a running flusher."""
+    db = MongoDB()
+    db.predictions = FakeCollection()
+    db._queue = asyncio.Queue(maxsize=queue_size)
+    db._flusher_task = asyncio.create_task(db._flusher())
+    db._is_connected = True
+    return db
+
+
+async def save(db, n):
+    for i in range(n):
+        await db.save_prediction(
+            text=f"article {i}", prediction="Real", confidence=0.9, model_version="test"
+        )
+
+
+class TestWriteQueue:
+    """Test suite for the background batch writer."""
+
+    def test_batches_respect_max_size(self, monkeypatch):
+        """Queued documents are flushed in batches of at most MONGO_WRITE_BATCH_SIZE."""
+        monkeypatch.setattr(database, "MONGO_WRITE_BATCH_SIZE", 4)
+
+        async def run():
+            db = make_db()
+            await save(db, 10)
+            await db.disconnect()
+            return db.predictions.batches
+
+        batches = asyncio.run(run())
+        assert sum(len(b) for b in batches) == 10
+        assert all(len(b) <= 4 for b in batches)
+
+    def test_flush_after_interval(self, monkeypatch):
+        """A partial batch is written once the flush interval elapses."""
+        monkeypatch.setattr(database, "MONGO_WRITE_FLUSH_MS", 10)
+
+        async def run():
+            db = make_db()
+            await save(db, 3)
+            await asyncio.sleep(0.1)
+            flushed = [len(b) for b in db.predictions.batches]
+            await db.disconnect()
+            return flushed
+
+        assert asyncio.run(run()) == [3]
+
+    def test_disconnect_keeps_in_flight_batch(self, monkeypatch):
+        """Documents the flusher already dequeued are inserted on shutdown."""
+        monkeypatch.setattr(database, "MONGO_WRITE_FLUSH_MS", 60_000)
+
+        async def run():
+            db = make_db()
+            await save(db, 5)
+            # Let the flusher pull the documents into its pending batch
+            await asyncio.sleep(0.01)
+            await db.disconnect()
+            return db
+
+        db = asyncio.run(run())
+        assert sum(len(b) for b in db.predictions.batches) == 5
+        assert db._flusher_task is None
+        assert not db.is_connected
+
+    def test_disconnect_with_full_queue(self, monkeypatch):
+        """Shutdown completes and persists everything even when the queue is full."""
+        monkeypatch.setattr(database, "MONGO_WRITE_BATCH_SIZE", 2)
+
+        async def run():
+            db = make_db(queue_size=3)
+            await save(db, 3)
+            await db.disconnect()
+            return db.predictions.batches
+
+        batches = asyncio.run(run())
+        assert sum(len(b) for b in batches) == 3
+
+    def test_queue_full_drops_prediction(self):
+        """Writes beyond the queue capacity are dropped, not raised."""
+        async def run():
+            db = make_db(queue_size=1)
+            db._flusher_task.cancel()
+            db._flusher_task = None
+            await save(db, 3)
+            return db._queue.qsize()
+
+        assert asyncio.run(run()) == 1
@@ -0,0 +1,393 @@
+"""
+Unit tests for inference internals that don't need the trained model.
+Uses a tiny in-memory tokenizer and stub models in place of BERT.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from backend.app import model
+from backend.app.model import FakeNewsClassifier, PredictionBatcher, SEQ_LEN_BUCKETS, top_classes
+
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "x", "fake", "real", "news"]
+
+
+@pytest.fixture(scope="module")
+def tokenizer(tmp_path_factory):
+    """Fast WordPiece tokenizer over a handful of tokens."""
+    vocab_file = tmp_path_factory.mktemp("vocab") / "vocab.txt"
+    vocab_file.write_text("\n".join(VOCAB) + "\n")
+    return transformers.BertTokenizerFast(vocab_file=str(vocab_file))
+
+
+@pytest.fixture
+def classifier(tokenizer):
+    """Unloaded classifier wired to the tiny tokenizer."""
+    clf = FakeNewsClassifier()
+    clf.tokenizer = tokenizer
+    return clf
+
+
+class TestTokenize:
+    """Test suite for bucketed tokenization."""
+
+    def test_single_text_is_batched(self, classifier):
+        """A single string still yields (1, seq_len) arrays."""
+        inputs = classifier._tokenize("x", 64)
+        assert inputs["input_ids"].ndim == 2
+        assert inputs["attention_mask"].shape == inputs["input_ids"].shape
+        assert inputs["input_ids"].shape[0] == 1
+
+    def test_pads_to_smallest_bucket(self, classifier):
+        """Short inputs are padded to the first bucket that fits."""
+        inputs = classifier._tokenize("x x x", 512)
+        assert inputs["input_ids"].shape == (1, SEQ_LEN_BUCKETS[0])
+
+    def test_batch_shares_longest_bucket(self, classifier):
+        """A batch is padded to the bucket of its longest row."""
+        inputs = classifier._tokenize(["x", "x " * 40], 512)
+        assert inputs["input_ids"].shape == (2, 64)
+
+    def test_truncates_to_max_length(self, classifier):
+        """Inputs longer than max_length are truncated to it."""
+        inputs = classifier._tokenize("x " * 1000, 128)
+        assert inputs["input_ids"].shape == (1, 128)
+
+
+class TestFastModelLabels:
+    """Test suite for the cascade label-space check."""
+
+    @staticmethod
+    def save_config(path, id2label):
+        transformers.BertConfig(
+            num_labels=len(id2label), id2label=id2label,
+            label2id={v: k for k, v in id2label.items()}
+        ).save_pretrained(str(path))
+        return str(path)
+
+    @pytest.mark.parametrize("fast_labels", [
+        {0: "Fake", 1: "Real", 2: "Satire"},
+        {0: "Real", 1: "Fake"},
+    ])
+    def test_mismatched_labels_disable_cascade(self, classifier, tmp_path, monkeypatch, fast_labels):
+        """A fast model with a different label space is never used."""
+        main_path = self.save_config(tmp_path / "main", {0: "Fake", 1: "Real"})
+        fast_path = self.save_config(tmp_path / "fast", fast_labels)
+        monkeypatch.setattr(model, "MODEL_PATH", main_path)
+        monkeypatch.setattr(model, "FAST_MODEL_PATH", fast_path)
+
+        assert classifier._load_fast_model() is False
+        assert classifier.fast_model is None
+        assert classifier.fast_tokenizer is None
+
+
+def softmax(logits):
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class TestTopClasses:
+    """Test suite for top_classes against a full softmax."""
+
+    @pytest.mark.parametrize("num_labels", [2, 3, 5])
+    @pytest.mark.parametrize("scale", [1.0, 30.0])
+    def test_matches_softmax(self, num_labels, scale):
+        """Class and confidence equal the argmax and max of the softmax."""
+        rng = np.random.default_rng(0)
+        logits = (rng.standard_normal((64, num_labels)) * scale).astype(np.float32)
+
+        predicted, confidences = top_classes(logits)
+        probs = softmax(logits.astype(np.float64))
+
+        np.testing.assert_array_equal(predicted, probs.argmax(axis=-1))
+        np.testing.assert_allclose(confidences, probs.max(axis=-1), rtol=1e-5)
+
+    def test_tied_logits(self):
+        """Equal logits give 0.5 confidence for two classes."""
+        predicted, confidences = top_classes(np.zeros((1, 2), dtype=np.float32))
+        assert predicted[0] == 0
+        assert confidences[0] == pytest.approx(0.5)
+
+
+class TestCascade:
+    """Test suite for fast-model escalation in _infer_batch."""
+
+    @pytest.fixture
+    def cascade(self, classifier, monkeypatch):
+        """Classifier whose fast/full models return canned logits per text."""
+        fast_logits = {"sure-fake": [6.0, -6.0], "unsure": [0.1, 0.0], "sure-real": [-6.0, 6.0]}
+        full_logits = {"unsure": [-2.0, 2.0]}
+        calls = {"fast": [], "full": []}
+
+        def run_fast(texts, max_length=512):
+            calls["fast"].append(list(texts))
+            return np.array([fast_logits[t] for t in texts], dtype=np.float32)
+
+        def run_full(texts, max_length=512):
+            calls["full"].append(list(texts))
+            return np.array([full_logits[t] for t in texts], dtype=np.float32)
+
+        classifier.fast_model = object()
+        monkeypatch.setattr(classifier, "_run_fast_model", run_fast)
+        monkeypatch.setattr(classifier, "_run_model", run_full)
+        monkeypatch.setattr(model, "FAST_MODEL_THRESHOLD", 0.98)
+        return classifier, calls
+
+    def test_only_unconfident_rows_escalate(self, cascade):
+        """Rows below the threshold go to the full model, merged back in order."""
+        clf, calls = cascade
+        results = clf._infer_batch(["sure-fake", "unsure", "sure-real"])
+
+        assert calls["fast"] == [["sure-fake", "unsure", "sure-real"]]
+        assert calls["full"] == [["unsure"]]
+        assert [c for c, _ in results] == [0, 1, 1]
+        assert results[1][1] == pytest.approx(float(softmax(np.array([-2.0, 2.0])).max()))
+        assert clf._fast_total == 3
+        assert clf._fast_escalated == 1
+
+    def test_no_escalation_skips_full_model(self, cascade):
+        """A fully confident batch never runs the full model."""
+        clf, calls = cascade
+        results = clf._infer_batch(["sure-real", "sure-fake"])
+
+        assert calls["full"] == []
+        assert [c for c, _ in results] == [1, 0]
+
+
+class StubClassifier:
+    """Duck-typed classifier recording predict_preprocessed batches."""
+
+    is_loaded = True
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def _preprocess(self, text):
+        if not text:
+            raise ValueError("empty")
+        return text, False
+
+    def predict_preprocessed(self, items):
+        self.batches.append([text for text, _ in items])
+        if self.fail:
+            raise RuntimeError("boom")
+        return [(text.upper(), 0.9) for text, _ in items]
+
+
+class TestPredictionBatcher:
+    """Test suite for request coalescing."""
+
+    @staticmethod
+    def run(clf, texts, window_ms=20, max_batch=16):
+        """Submit texts concurrently through a fresh batcher."""
+        async def main():
+            batcher = PredictionBatcher(clf, window_ms, max_batch)
+            batcher.start()
+            try:
+                return await asyncio.gather(
+                    *(batcher.predict(t) for t in texts), return_exceptions=True
+                )
+            finally:
+                await batcher.stop()
+                assert not batcher.enabled
+        return asyncio.run(main())
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests inside one window become one call, results in order."""
+        clf = StubClassifier()
+        results = self.run(clf, ["a", "b", "c"])
+
+        assert clf.batches == [["a", "b", "c"]]
+        assert results == [("A", 0.9), ("B", 0.9), ("C", 0.9)]
+
+    def test_max_batch_splits_batches(self):
+        """No batch exceeds max_batch items."""
+        clf = StubClassifier()
+        results = self.run(clf, list("abcde"), max_batch=2)
+
+        assert [len(b) for b in clf.batches] == [2, 2, 1]
+        assert [r[0] for r in results] == list("ABCDE")
+
+    def test_invalid_input_fails_alone(self):
+        """Validation errors surface to their caller without being queued."""
+        clf = StubClassifier()
+        results = self.run(clf, ["a", "", "b"])
+
+        assert isinstance(results[1], ValueError)
+        assert results[0] == ("A", 0.9) and results[2] == ("B", 0.9)
+        assert clf.batches == [["a", "b"]]
+
+    def test_batch_error_fails_every_request(self):
+        """An inference error is raised to every request in the batch."""
+        results = self.run(StubClassifier(fail=True), ["a", "b"])
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestModelFingerprint:
+    """Test suite for the checkpoint content fingerprint."""
+
+    @pytest.fixture
+    def checkpoint(self, tmp_path):
+        (tmp_path / "config.json").write_text('{"num_labels": 2}')
+        (tmp_path / "model.safetensors").write_bytes(b"\x00" * 4096)
+        return tmp_path
+
+    def test_ignores_mtime(self, checkpoint):
+        """A re-download with identical bytes keeps the fingerprint."""
+        before = model.model_fingerprint(str(checkpoint))
+        os.utime(checkpoint / "model.safetensors", (0, 0))
+        assert model.model_fingerprint(str(checkpoint)) == before
+
+    def test_tracks_weight_content(self, checkpoint):
+        """Same-size weights with different bytes change the fingerprint."""
+        before = model.model_fingerprint(str(checkpoint))
+        (checkpoint / "model.safetensors").write_bytes(b"\x01" * 4096)
+        assert model.model_fingerprint(str(checkpoint)) != before
+
+
+class TestInferenceCache:
+    """Test suite for result caching on the single and batched paths."""
+
+    ARTICLE = "Officials confirmed the report on Tuesday."
+    OTHER = "Another article with different content."
+
+    @pytest.fixture
+    def cached(self, classifier, monkeypatch):
+        """Loaded classifier whose forward pass records its inputs."""
+        calls = []
+
+        def infer_batch(texts):
+            calls.append(list(texts))
+            return [(1, 0.95) for _ in texts]
+
+        classifier._is_loaded = True
+        monkeypatch.setattr(classifier, "_infer_batch", infer_batch)
+        return classifier, calls
+
+    def test_repeat_under_batching_skips_model(self, cached):
+        """A text already classified is not sent to _infer_batch again."""
+        clf, calls = cached
+
+        async def main():
+            batcher = PredictionBatcher(clf, 20, 16)
+            batcher.start()
+            try:
+                first = await asyncio.gather(batcher.predict(self.ARTICLE), batcher.predict(self.ARTICLE))
+                second = await asyncio.gather(batcher.predict(self.ARTICLE), batcher.predict(self.OTHER))
+            finally:
+                await batcher.stop()
+            return first, second
+
+        first, second = asyncio.run(main())
+
+        assert len(calls) == 2
+        # Duplicates in one batch run once; the repeat in the next batch is a hit
+        assert len(calls[0]) == 1
+        assert calls[1] == [clf._preprocess(self.OTHER)[0]]
+        assert first[0] == first[1] == second[0]
+
+    def test_single_and_batch_paths_share_cache(self, cached):
+        """predict and predict_batch answer from the same cache."""
+        clf, calls = cached
+        clf.predict(self.ARTICLE)
+        clf.predict_batch([self.ARTICLE, self.ARTICLE])
+        assert len(calls) == 1
+
+    def test_cache_is_bounded(self, cached, monkeypatch):
+        """The least recently used entry is evicted at INFERENCE_CACHE_SIZE."""
+        clf, calls = cached
+        monkeypatch.setattr(model, "INFERENCE_CACHE_SIZE", 1)
+        clf.predict(self.ARTICLE)
+        clf.predict(self.OTHER)
+        clf.predict(self.ARTICLE)
+        assert len(calls) == 3
+
+
+class TestBatchMetadata:
+    """Test suite for predict_batch_with_metadata."""
+
+    def test_one_forward_pass_with_metadata(self, classifier, monkeypatch):
+        """Metadata comes with the batch results, without extra model calls."""
+        calls = []
+
+        def infer_batch(texts):
+            calls.append(list(texts))
+            return [(1, 0.95) for _ in texts]
+
+        classifier._is_loaded = True
+        monkeypatch.setattr(classifier, "_infer_batch", infer_batch)
+        texts = [TestInferenceCache.ARTICLE, TestInferenceCache.OTHER]
+
+        results = classifier.predict_batch_with_metadata(texts)
+
+        assert len(calls) == 1
+        assert results == [classifier.predict_with_metadata(t) for t in texts]
+        assert len(calls) == 1
+        assert results[0]["metadata"]["confidence_category"] == "high"
+
+
+class TestTraceModel:
+    """Test suite for TorchScript tracing with bucket validation."""
+
+    @pytest.fixture
+    def tiny(self, classifier):
+        """Classifier wrapping a randomly initialised one-layer BERT."""
+        config = transformers.BertConfig(
+            vocab_size=len(VOCAB), hidden_size=16, num_hidden_layers=1,
+            num_attention_heads=2, intermediate_size=32, num_labels=2, torchscript=True
+        )
+        classifier.model = transformers.BertForSequenceClassification(config).eval()
+        return classifier
+
+    def test_trace_runs_every_bucket(self, tiny):
+        """A successful trace serves every bucket length."""
+        assert tiny._trace_model() is True
+        assert tiny._traced
+        for max_length in SEQ_LEN_BUCKETS:
+            logits = tiny._run_model(["x " * max_length], max_length=max_length)
+            assert logits.shape == (1, 2)
+
+    def test_bucket_failure_keeps_eager_model(self, tiny, monkeypatch):
+        """If the trace fails on any bucket, the eager model stays in place."""
+        eager = tiny.model
+
+        def fail():
+            raise RuntimeError("shape mismatch")
+
+        monkeypatch.setattr(tiny, "_check_buckets", fail)
+        assert tiny._trace_model() is False
+        assert tiny.model is eager
+        assert not tiny._traced
+
+
+class TestPreprocessCache:
+    """Test suite for the digest-keyed preprocessing cache."""
+
+    def test_keys_are_short_digests(self, classifier, monkeypatch):
+        """Raw articles are never kept as cache keys, and repeats skip _prep."""
+        calls = []
+        prep = classifier._prep
+        monkeypatch.setattr(classifier, "_prep", lambda text: calls.append(text) or prep(text))
+        article = "A long submitted article body. " * 200
+
+        first = classifier._preprocess(article)
+        second = classifier._preprocess(article)
+
+        assert first == second
+        assert len(calls) == 1
+        assert all(isinstance(k, bytes) and len(k) == 16 for k in classifier._prep_cache)
+
+    def test_cache_is_bounded(self, classifier, monkeypatch):
+        """The least recently used entry is evicted at PREPROCESS_CACHE_SIZE."""
+        monkeypatch.setattr(model, "PREPROCESS_CACHE_SIZE", 2)
+        for text in ("First article text.", "Second article text.", "Third article text."):
+            classifier._preprocess(text)
+        assert len(classifier._prep_cache) == 2
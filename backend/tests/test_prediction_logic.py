@@ -4,7 +4,7 @@ Validates confidence-aware decision making and edge cases.
 """
 
 import pytest
-from backend.app.model import FakeNewsClassifier, CONFIDENCE_HIGH, CONFIDENCE_MEDIUM
+from backend.app.model import get_classifier, CONFIDENCE_HIGH, CONFIDENCE_MEDIUM
 
 
 # Sample test texts
@@ -35,12 +35,10 @@ VERY_SHORT = "News today"
 class TestPredictionLogic:
     """Test suite for confidence-aware prediction logic."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def classifier(self):
-        """Create and load classifier instance."""
-        clf = FakeNewsClassifier()
-        clf.load()
-        return clf
+        """Loaded process-wide classifier (shared by all tests)."""
+        return get_classifier()
     
     def test_input_validation_empty(self, classifier):
         """Test that empty input raises ValueError."""
@@ -108,7 +106,7 @@ class TestPredictionLogic:
         assert 0.0 <= confidence <= 1.0
         
         # Check confidence precision
-        assert len(str(confidence).split('.')[-1]) <= 4  # Max 4 decimal places
+        assert round(confidence, 4) == confidence  # Max 4 decimal places
     
     def test_metadata_function(self, classifier):
         """Test predict_with_metadata returns correct structure."""
@@ -156,8 +154,10 @@ def manual_test_examples():
     Manual test cases to verify prediction logic.
     Run this to see actual predictions on various inputs.
     """
-    classifier = FakeNewsClassifier()
-    classifier.load()
+    classifier = get_classifier()
+    if not classifier.is_loaded:
+        print("Model failed to load; see the log above.")
+        return
     
     test_cases = [
         ("Long Real Article", LONG_REAL_ARTICLE),
@@ -171,17 +171,25 @@ def manual_test_examples():
     print("MANUAL TEST RESULTS")
     print("="*80 + "\n")
     
-    for name, text in test_cases:
+    # One batched forward pass when every case is valid; otherwise classify
+    # case by case so each rejected input is reported on its own
+    try:
+        results = classifier.predict_batch_with_metadata([text for _, text in test_cases])
+    except ValueError:
+        results = [None] * len(test_cases)
+    
+    for (name, text), result in zip(test_cases, results):
         try:
-            prediction, confidence = classifier.predict_news_final(text)
-            result = classifier.predict_with_metadata(text)
+            result = result or classifier.predict_with_metadata(text)
+            prediction, confidence = result["prediction"], result["confidence"]
+            metadata = result["metadata"]
             
             print(f"Test: {name}")
             print(f"Text: {text[:100]}...")
             print(f"Prediction: {prediction}")
             print(f"Confidence: {confidence:.4f}")
-            print(f"Is Headline: {result['metadata']['is_headline_only']}")
-            print(f"Confidence Category: {result['metadata']['confidence_category']}")
+            print(f"Is Headline: {metadata['is_headline_only']}")
+            print(f"Confidence Category: {metadata['confidence_category']}")
             print("-" * 80 + "\n")
             
         except Exception as e:
@@ -0,0 +1,136 @@
+"""
+Tests for the per-IP token bucket rate limiter and its 429 response.
+"""
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("torch")
+
+from backend.app import main
+from backend.app.main import (
+    ObservabilityMiddleware,
+    RATE_LIMIT_REFILL_RATE,
+    RATE_LIMIT_REQUESTS,
+    is_rate_limited,
+    rate_limit_store,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store():
+    return OrderedDict()
+
+
+class TestTokenBucket:
+    """Test suite for is_rate_limited."""
+
+    def test_burst_up_to_capacity(self, clock, store):
+        """A client may send RATE_LIMIT_REQUESTS requests before being limited."""
+        results = [is_rate_limited("1.1.1.1", _now=clock, _store=store) for _ in range(RATE_LIMIT_REQUESTS)]
+        assert not any(results)
+        assert is_rate_limited("1.1.1.1", _now=clock, _store=store)
+
+    def test_refill_over_time(self, clock, store):
+        """Tokens refill proportionally to elapsed time."""
+        for _ in range(RATE_LIMIT_REQUESTS):
+            is_rate_limited("1.1.1.1", _now=clock, _store=store)
+        assert is_rate_limited("1.1.1.1", _now=clock, _store=store)
+
+        clock.now += 1 / RATE_LIMIT_REFILL_RATE
+        assert not is_rate_limited("1.1.1.1", _now=clock, _store=store)
+        assert is_rate_limited("1.1.1.1", _now=clock, _store=store)
+
+    def test_refill_capped_at_capacity(self, clock, store):
+        """A long idle period never grants more than a full bucket."""
+        is_rate_limited("1.1.1.1", _now=clock, _store=store)
+        clock.now += 3600
+        results = [is_rate_limited("1.1.1.1", _now=clock, _store=store) for _ in range(RATE_LIMIT_REQUESTS + 1)]
+        assert results.count(True) == 1
+
+    def test_clients_are_independent(self, clock, store):
+        """One client exhausting its bucket does not limit another."""
+        for _ in range(RATE_LIMIT_REQUESTS + 1):
+            is_rate_limited("1.1.1.1", _now=clock, _store=store)
+        assert not is_rate_limited("2.2.2.2", _now=clock, _store=store)
+
+    def test_cap_evicts_least_recently_seen(self, clock, store):
+        """At the cap the least recently seen client is evicted."""
+        for ip in ("a", "b", "c"):
+            is_rate_limited(ip, _now=clock, _store=store, _max_tracked=3)
+        # Touch "a" so "b" becomes the oldest
+        is_rate_limited("a", _now=clock, _store=store, _max_tracked=3)
+        is_rate_limited("d", _now=clock, _store=store, _max_tracked=3)
+
+        assert list(store) == ["c", "a", "d"]
+
+
+class TestRateLimitMiddleware:
+    """Test suite for the 429 path in ObservabilityMiddleware."""
+
+    @pytest.fixture(autouse=True)
+    def clear_store(self):
+        rate_limit_store.clear()
+        yield
+        rate_limit_store.clear()
+
+    @staticmethod
+    def call(middleware, path="/analyze", client=("9.9.9.9", 1234)):
+        """Run one HTTP request through the middleware and collect sent messages."""
+        sent = []
+        scope = {"type": "http", "path": path, "client": client}
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(middleware(scope, receive, send))
+        return sent
+
+    @pytest.fixture
+    def middleware(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        return ObservabilityMiddleware(app)
+
+    def test_returns_429_when_limited(self, middleware):
+        """Requests beyond the bucket capacity get a JSON 429 with API headers."""
+        for _ in range(RATE_LIMIT_REQUESTS):
+            assert self.call(middleware)[0]["status"] == 200
+
+        start, body = self.call(middleware)
+        assert start["status"] == 429
+        headers = dict(start["headers"])
+        assert headers[b"content-type"] == b"application/json"
+        assert b"x-api-version" in headers
+        assert b"Too many requests" in body["body"]
+        # The shared template must not collect per-request headers
+        assert len(main.RATE_LIMITED_START["headers"]) == 2
+
+    def test_other_paths_not_limited(self, middleware):
+        """Only RATE_LIMITED_PATHS consume tokens."""
+        for _ in range(RATE_LIMIT_REQUESTS + 5):
+            assert self.call(middleware, path="/history")[0]["status"] == 200
+        assert not rate_limit_store
@@ -0,0 +1,97 @@
+"""
+Tests for training-time helpers.
+Compares the numba word scan with the pure-Python fallback, and the
+training checkpoint fingerprint with the backend's.
+"""
+
+import importlib.util
+
+import pytest
+
+for module in ("torch", "datasets", "sklearn", "transformers"):
+    pytest.importorskip(module)
+
+from backend.app import model
+from model_training import train
+
+
+requires_numba = pytest.mark.skipif(
+    importlib.util.find_spec("numba") is None, reason="numba not installed"
+)
+
+
+ASCII_CASES = [
+    "",
+    "one",
+    "one two three four five six",
+    "  leading and trailing spaces  ",
+    "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds",
+    "multiple    spaces   between     words here",
+    "café naïve 東京 🚀 unicode words separated by ascii spaces",
+]
+
+UNICODE_SPACE_CASES = [
+    "non\u00a0breaking space between\u00a0words",
+    "ideographic\u3000space and em\u2003space",
+]
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """truncate_texts with numba disabled."""
+    def run(texts, max_words):
+        with monkeypatch.context() as m:
+            m.setattr(train, "njit", None)
+            return train.truncate_texts(texts, max_words)
+    return run
+
+
+@requires_numba
+class TestTruncateTexts:
+    """Test suite for truncate_texts."""
+
+    @pytest.mark.parametrize("max_words", [1, 3, 5, 1000])
+    def test_numba_matches_fallback_words(self, fallback, max_words):
+        """Both paths keep the same words for ASCII-separated text."""
+        numba_out = train.truncate_texts(ASCII_CASES, max_words)
+        fallback_out = fallback(ASCII_CASES, max_words)
+        assert [t.split() for t in numba_out] == [t.split() for t in fallback_out]
+
+    @pytest.mark.parametrize("max_words", [1, 2, 4])
+    def test_unicode_spaces_keep_fallback_prefix(self, fallback, max_words):
+        """The byte scan never drops words the fallback would keep."""
+        numba_out = train.truncate_texts(UNICODE_SPACE_CASES, max_words)
+        fallback_out = fallback(UNICODE_SPACE_CASES, max_words)
+        for kept, expected in zip(numba_out, fallback_out):
+            words = kept.split()
+            assert words[:len(expected.split())] == expected.split()
+
+    def test_short_text_returned_unchanged(self):
+        """Texts under the limit are passed through as-is."""
+        text = "short  text\twith   odd spacing"
+        assert train.truncate_texts([text], 100) == [text]
+
+    def test_output_is_valid_utf8_prefix(self):
+        """Cuts land on whitespace, so multibyte characters are never split."""
+        text = "東京 " * 50
+        (out,) = train.truncate_texts([text], 10)
+        assert text.startswith(out)
+        assert out.split() == ["東京"] * 10
+
+
+class TestModelFingerprint:
+    """Test suite for the training/backend fingerprint mirror."""
+
+    def test_matches_backend(self, tmp_path):
+        """Training and backend hash the same checkpoint identically."""
+        (tmp_path / "config.json").write_text('{"num_labels": 2}')
+        (tmp_path / "model.safetensors").write_bytes(bytes(range(256)) * 9000)
+        (tmp_path / "pytorch_model.bin").write_bytes(b"weights")
+        (tmp_path / "tokenizer.json").write_text("{}")
+
+        assert train.model_fingerprint(str(tmp_path)) == model.model_fingerprint(str(tmp_path))
+
+    def test_sentinel_constants_match_backend(self):
+        """The sentinel is written where the backend looks for it."""
+        assert train.ONNX_SENTINEL_FILE == model.ONNX_SENTINEL_FILE
+        assert train.FINGERPRINT_CHUNK == model.FINGERPRINT_CHUNK
@@ -0,0 +1,74 @@
+"""
+Tests for text preprocessing.
+Checks the fused (and optional RE2) clean_text against the original
+sequential regex passes.
+"""
+
+import html
+import re
+
+import pytest
+
+from backend.app import utils
+from backend.app.utils import clean_text, truncate_text
+
+
+def reference_clean_text(text: str) -> str:
+    """Original clean_text: one re.sub per pattern, then whitespace collapse."""
+    text = html.unescape(text)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+CASES = [
+    "Plain sentence with no markup at all.",
+    "  Leading and trailing   whitespace\t\tand\n\nnewlines  ",
+    "<p>Breaking <b>news</b> from the <a href='x'>capital</a>.</p>",
+    "Read more at https://example.com/story?id=1 today",
+    "Visit www.example.org/path or http://a.b/c for details",
+    "Contact press@example.com or tips@news.org for comments",
+    "Fish &amp; chips &lt;not a tag&gt; and &quot;quotes&quot;",
+    "Mixed <i>tags</i>, https://t.co/x links and me@x.io mail",
+    "Unicode text: café, naïve, 東京, emoji 🚀 stay intact",
+    "URL before nbsp https://example.com\u00a0next word",
+    "Em\u2003space and ideographic\u3000space separated",
+    "",
+    "<br/><br/>",
+]
+
+
+class TestCleanText:
+    """Test suite for clean_text."""
+
+    @pytest.mark.parametrize("text", CASES)
+    def test_matches_sequential_passes(self, text):
+        """The fused pattern gives the same result as the original passes."""
+        assert clean_text(text) == reference_clean_text(text)
+
+    @pytest.mark.parametrize("text", CASES)
+    def test_re2_matches_re(self, text, monkeypatch):
+        """The RE2 build of the pattern behaves like the re build."""
+        pytest.importorskip("re2")
+        re2_pattern = utils._compile_strip_re()
+        monkeypatch.setattr(utils, "re2", None)
+        re_pattern = utils._compile_strip_re()
+        assert re2_pattern.sub('', text) == re_pattern.sub('', text)
+
+    def test_idempotent(self):
+        """Cleaning already-clean text is a no-op."""
+        for text in CASES:
+            cleaned = clean_text(text)
+            assert clean_text(cleaned) == cleaned
+
+
+class TestTruncateText:
+    """Test suite for truncate_text."""
+
+    def test_keeps_short_text(self):
+        assert truncate_text("one two three", max_length=5) == "one two three"
+
+    def test_truncates_to_word_count(self):
+        assert truncate_text("a b c d e f", max_length=3) == "a b c"
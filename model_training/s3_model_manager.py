@@ -7,13 +7,22 @@ Complements the bash upload script with Python utilities
 import os
 import sys
 import json
+import hashlib
 import argparse
 import logging
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from tqdm import tqdm
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError
 except ImportError:
     print("❌ boto3 not installed. Install with: pip install boto3")
@@ -26,6 +35,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Newer botocore checksums every payload by default; only do it when an
+# operation requires it (no-op on versions that predate the setting)
+os.environ.setdefault('AWS_REQUEST_CHECKSUM_CALCULATION', 'WHEN_REQUIRED')
+
+# Local record of file digests, so unchanged files are not re-hashed
+UPLOAD_CACHE_FILE = '.upload_cache.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Progress is logged every PROGRESS_EVERY files (the tqdm bar only draws
+# on a terminal, so piped logs such as CloudWatch get these lines instead)
+PROGRESS_EVERY = 32
+
+# Files transferred at once, and multipart settings for large weight files
+MAX_WORKERS = 8
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(root: str) -> Iterator[str]:
+    """Yield file paths under root as the tree is walked (os.scandir)"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file():
+                yield entry.path
+
 
 class S3ModelManager:
     """Manages model uploads and downloads from S3"""
@@ -39,8 +88,18 @@ class S3ModelManager:
             aws_region: AWS region (optional, uses default if not specified)
         """
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client('s3', region_name=aws_region)
-        self.s3_resource = boto3.resource('s3', region_name=aws_region)
+        # One client shared by every call and transfer thread; the pool
+        # covers MAX_WORKERS files each running multipart parts
+        self.s3_client = boto3.client(
+            's3',
+            region_name=aws_region,
+            config=Config(
+                max_pool_connections=32,
+                retries={'mode': 'adaptive', 'max_attempts': 5},
+                tcp_keepalive=True,
+                s3={'addressing_style': 'virtual', 'use_accelerate_endpoint': False}
+            )
+        )
     
     def bucket_exists(self) -> bool:
         """Check if bucket exists and is accessible"""
@@ -62,6 +121,9 @@ class S3ModelManager:
         """
         Upload entire directory to S3
         
+        Files are stored with their SHA-256 in object metadata; files whose
+        digest matches the existing object are skipped.
+        
         Args:
             local_dir: Local directory path
             s3_prefix: S3 key prefix (e.g., 'models/bert-v1')
@@ -75,27 +137,98 @@ class S3ModelManager:
             logger.error(f"❌ Directory not found: {local_dir}")
             return 0, []
         
-        files_uploaded = 0
-        failed_files = []
+        # (rel_path -> size, mtime, sha256) from previous runs
+        cache_path = local_path / UPLOAD_CACHE_FILE
+        try:
+            hash_cache = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            hash_cache = {}
+        
+        def digest_for(file_path: str, rel_path: str) -> str:
+            """SHA-256 of the file, reusing the cached one if size/mtime match"""
+            stat = os.stat(file_path)
+            entry = hash_cache.get(rel_path)
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                return entry['sha256']
+            digest = file_sha256(file_path)
+            with lock:
+                hash_cache[rel_path] = {
+                    'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': digest
+                }
+            return digest
         
-        for file_path in local_path.rglob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(local_path)
-                s3_key = f"{s3_prefix}/{rel_path}".replace('\\', '/')
+        def remote_sha256(s3_key: str) -> Optional[str]:
+            """sha256 metadata of the existing object, if any"""
+            try:
+                head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+                return head.get('Metadata', {}).get('sha256')
+            except ClientError:
+                return None
+        
+        def upload(file_path: str) -> str:
+            """Upload one file; return 'uploaded', 'skipped' or 'failed'"""
+            rel_path = Path(file_path).relative_to(local_path)
+            s3_key = f"{s3_prefix}/{rel_path}".replace('\\', '/')
+            
+            try:
+                digest = digest_for(file_path, str(rel_path))
+                if remote_sha256(s3_key) == digest:
+                    return 'skipped'
                 
-                try:
-                    logger.info(f"  Uploading {rel_path}...")
-                    self.s3_client.upload_file(
-                        str(file_path),
-                        self.bucket_name,
-                        s3_key
-                    )
-                    files_uploaded += 1
-                except Exception as e:
-                    logger.error(f"  ❌ Failed to upload {rel_path}: {e}")
-                    failed_files.append(str(rel_path))
+                self.s3_client.upload_file(
+                    file_path,
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs={'Metadata': {'sha256': digest}},
+                    Config=TRANSFER_CONFIG
+                )
+                return 'uploaded'
+            except Exception as e:
+                logger.error(f"  ❌ Failed to upload {rel_path}: {e}")
+                failed_files.append(str(rel_path))
+                return 'failed'
+        
+        # Walk the tree on this thread while workers upload what it finds;
+        # the bounded queue keeps the walk only slightly ahead of the network
+        paths: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=64)
+        lock = threading.Lock()
+        counts = {'uploaded': 0, 'skipped': 0, 'failed': 0}
+        failed_files = []
+        
+        progress = tqdm(unit='file', desc='Uploading', disable=None)
         
-        return files_uploaded, failed_files
+        def worker():
+            while (file_path := paths.get()) is not None:
+                status = upload(file_path)
+                with lock:
+                    counts[status] += 1
+                    done = sum(counts.values())
+                progress.update()
+                if done % PROGRESS_EVERY == 0:
+                    logger.info(f"  {done} files processed...")
+        
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(MAX_WORKERS)]
+        for t in workers:
+            t.start()
+        try:
+            for file_path in iter_files(local_dir):
+                if os.path.basename(file_path) != UPLOAD_CACHE_FILE:
+                    paths.put(file_path)
+        finally:
+            for _ in workers:
+                paths.put(None)
+            for t in workers:
+                t.join()
+            progress.close()
+        
+        try:
+            cache_path.write_text(json.dumps(hash_cache))
+        except OSError as e:
+            logger.warning(f"  Could not write {UPLOAD_CACHE_FILE}: {e}")
+        
+        if counts['skipped']:
+            logger.info(f"  Skipped {counts['skipped']} unchanged files")
+        return counts['uploaded'], failed_files
     
     def list_models(self, prefix: str = 'models/') -> Dict[str, List[str]]:
         """
@@ -107,30 +240,27 @@ class S3ModelManager:
         Returns:
             Dict mapping version tags to file lists
         """
-        models = {}
+        models = defaultdict(list)
         
         try:
             paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+            pages = paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=prefix,
+                PaginationConfig={'PageSize': 1000}
+            )
             
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # Extract version from path: models/bert-v1/file.txt
-                    parts = key.split('/')
-                    if len(parts) >= 2:
-                        version = parts[1]
-                        if version not in models:
-                            models[version] = []
-                        models[version].append(key)
+            # Extract version from path: models/bert-v1/file.txt
+            keys = (obj['Key'] for page in pages for obj in page.get('Contents', ()))
+            for key in keys:
+                parts = key.split('/', 2)
+                if len(parts) >= 2:
+                    models[parts[1]].append(key)
         
         except ClientError as e:
             logger.error(f"❌ Error listing models: {e}")
         
-        return models
+        return dict(models)
     
     def get_bucket_size(self, prefix: str = '') -> Tuple[int, int]:
         """
@@ -147,15 +277,17 @@ class S3ModelManager:
         
         try:
             paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+            pages = paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=prefix,
+                PaginationConfig={'PageSize': 1000}
+            )
             
+            # One generator sum per page; the count comes from len()
             for page in pages:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    total_size += obj['Size']
-                    file_count += 1
+                contents = page.get('Contents', ())
+                total_size += sum(obj['Size'] for obj in contents)
+                file_count += len(contents)
         
         except ClientError as e:
             logger.error(f"❌ Error calculating bucket size: {e}")
@@ -175,6 +307,29 @@ class S3ModelManager:
         """
         local_path = Path(local_dir)
         local_path.mkdir(parents=True, exist_ok=True)
+        # Trailing slash so 'models/bert-v1' never matches 'models/bert-v10/...'
+        s3_prefix = s3_prefix.rstrip('/') + '/'
+        
+        def download(s3_key: str) -> Optional[str]:
+            """Download one object; return its relative path on failure"""
+            # Preserve directory structure
+            rel_path = s3_key[len(s3_prefix):]
+            local_file = local_path / rel_path
+            
+            # Create parent directories
+            local_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            try:
+                self.s3_client.download_file(
+                    self.bucket_name,
+                    s3_key,
+                    str(local_file),
+                    Config=TRANSFER_CONFIG
+                )
+                return None
+            except Exception as e:
+                logger.error(f"  ❌ Failed to download {rel_path}: {e}")
+                return rel_path
         
         files_downloaded = 0
         failed_files = []
@@ -186,30 +341,22 @@ class S3ModelManager:
                 Prefix=s3_prefix
             )
             
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    s3_key = obj['Key']
-                    # Preserve directory structure
-                    rel_path = s3_key[len(s3_prefix):].lstrip('/')
-                    local_file = local_path / rel_path
-                    
-                    # Create parent directories
-                    local_file.parent.mkdir(parents=True, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+                    tqdm(unit='file', desc='Downloading', disable=None) as progress:
+                for page in pages:
+                    if 'Contents' not in page:
+                        continue
                     
-                    try:
-                        logger.info(f"  Downloading {rel_path}...")
-                        self.s3_client.download_file(
-                            self.bucket_name,
-                            s3_key,
-                            str(local_file)
-                        )
-                        files_downloaded += 1
-                    except Exception as e:
-                        logger.error(f"  ❌ Failed to download {rel_path}: {e}")
-                        failed_files.append(rel_path)
+                    keys = [obj['Key'] for obj in page['Contents']]
+                    for failed in executor.map(download, keys):
+                        if failed is None:
+                            files_downloaded += 1
+                        else:
+                            failed_files.append(failed)
+                        progress.update()
+                        done = files_downloaded + len(failed_files)
+                        if done % PROGRESS_EVERY == 0:
+                            logger.info(f"  {done} files processed...")
         
         except ClientError as e:
             logger.error(f"❌ Error downloading model: {e}")
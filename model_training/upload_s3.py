@@ -3,6 +3,7 @@ import os
 import argparse
 import logging
 from botocore.exceptions import ClientError
+from tqdm import tqdm
 
 # Configure logging
 logging.basicConfig(
@@ -11,6 +12,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PROGRESS_EVERY = 32  # Log a progress line every N files
+
 def upload_to_s3(local_dir, bucket_name, version_tag):
     """
     Uploads a directory of model artifacts to S3 with a version tag.
@@ -33,20 +36,20 @@ def upload_to_s3(local_dir, bucket_name, version_tag):
         return False
 
     files_uploaded = 0
-    for root, dirs, files in os.walk(local_dir):
-        for file in files:
-            local_path = os.path.join(root, file)
-            # Create relative path to preserve directory structure in S3
-            rel_path = os.path.relpath(local_path, local_dir)
-            s3_key = f"{prefix}/{rel_path}"
-            
-            logger.info(f"  Uploading {rel_path}...")
-            try:
-                s3_client.upload_file(local_path, bucket_name, s3_key)
-                files_uploaded += 1
-            except Exception as e:
-                logger.error(f"  FAILED to upload {file}: {e}")
-                return False
+    files = [os.path.join(root, f) for root, _, names in os.walk(local_dir) for f in names]
+    for local_path in tqdm(files, unit='file', desc='Uploading', disable=None):
+        # Create relative path to preserve directory structure in S3
+        rel_path = os.path.relpath(local_path, local_dir)
+        s3_key = f"{prefix}/{rel_path}"
+        
+        try:
+            s3_client.upload_file(local_path, bucket_name, s3_key)
+            files_uploaded += 1
+        except Exception as e:
+            logger.error(f"  FAILED to upload {rel_path}: {e}")
+            return False
+        if files_uploaded % PROGRESS_EVERY == 0:
+            logger.info(f"  Uploaded {files_uploaded}/{len(files)} files...")
 
     logger.info(f"✅ Successfully uploaded {files_uploaded} model artifacts to S3!")
     logger.info(f"📍 Model Key: {prefix}")